@@ -0,0 +1,66 @@
+import logging
+from pathlib import Path
+from typing import Optional
+
+from parsing import fetch_cache
+from parsing.fetch_cache import FetchCache
+from parsing.webpage_parser import valid_address, fetch_html
+
+# html snapshots of the webpages in the performance analysis datasets, an archive of recorded webpages
+CORPUS_DIR = (Path(__file__).parent / "corpus/").resolve()
+DATASETS_DIR = (Path(__file__).parent.parent / "analysis/datasets/").resolve()
+
+logger = logging.getLogger("alpaca")
+
+
+def dataset_urls() -> list[str]:
+    """Returns the URLs of all performance analysis datasets, in a fixed order and without duplicates."""
+
+    urls = []
+    for dataset in sorted(DATASETS_DIR.glob("*")):
+        with open(dataset, "r") as datasetIO:
+            for line in datasetIO.readlines()[1:]:  # first line is column headers
+                url = line.split(";")[0].strip()
+                if not valid_address(url):
+                    url = "http://" + url
+                if url not in urls:
+                    urls.append(url)
+    return urls
+
+
+def open_corpus(directory: Path = CORPUS_DIR) -> FetchCache:
+    """Returns the snapshot corpus, see fetch_cache.enable_recording()."""
+
+    return FetchCache(directory)
+
+
+def build_corpus(directory: Path = CORPUS_DIR, limit: Optional[int] = None):
+    """Downloads html snapshots of the dataset URLs that are missing from the corpus (requires network access).
+
+    :param directory: Directory holding the corpus.
+    :param limit: Only consider the first **limit** dataset URLs.
+    """
+
+    corpus = open_corpus(directory)
+    fetch_cache.enable_recording(directory)
+    try:
+        for url in dataset_urls()[:limit]:
+            if corpus.metadata(url) is None and not fetch_html(url):
+                logger.error("[Benchmark] Could not download " + url)
+    finally:
+        fetch_cache.disable_archive()
+
+
+def corpus_urls(directory: Path = CORPUS_DIR, limit: Optional[int] = None) -> list[str]:
+    """Returns the dataset URLs with a snapshot in the corpus, in dataset order."""
+
+    if not directory.exists():
+        return []
+    corpus = open_corpus(directory)
+    return [url for url in dataset_urls()[:limit] if corpus.metadata(url) is not None]
+
+
+def use_corpus(directory: Path = CORPUS_DIR):
+    """Serves all webpages from the corpus, webpages missing from it are never downloaded."""
+
+    fetch_cache.enable_replay(directory)
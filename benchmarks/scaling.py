@@ -0,0 +1,199 @@
+import argparse
+import csv
+import logging
+import math
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import deadlines
+import model_registry
+from parsing.tokenize import annotate, sent_tokenize, word_tokenize
+from parsing.webpage_data import WebpageData
+from parsing.webpage_parser import parse_html
+from scoring.credibility_evaluation import evaluation_signals
+
+# text sizes in characters, roughly half a power of ten apart
+SIZES = [1_000, 3_000, 10_000, 30_000, 100_000, 300_000, 1_000_000]
+# growth exponent (time ~ size^exponent between the two largest sizes) from which a stage is reported as super-linear
+SUPERLINEAR_EXPONENT = 1.2
+RESULTS_DIR = (Path(__file__).parent / "results/").resolve()
+
+# vocabulary of the synthetic texts, covering what the evaluators look for: names and acronyms (entities), all caps
+# words, emotional and profane words, questions and exclamations
+_WORDS = ("the a of to and in that is was for on with as by at from people government report study new said would "
+          "could many more than most year time health public vaccine news world country week city police market "
+          "love hate fear joy anger terrible wonderful shocking amazing damn crap").split()
+_NAMES = ["Barack Obama", "New York", "the United Nations", "NASA", "the FBI", "Angela Merkel", "Johns Hopkins"]
+_SHOUTS = ["BREAKING", "WOW", "NEVER", "TRUTH"]
+_ENDINGS = [".", ".", ".", ".", "?", "!"]
+
+logger = logging.getLogger("alpaca")
+
+
+def synthetic_text(size: int, seed: int = 0) -> str:
+    """Returns deterministic English-like text of about **size** characters, in paragraphs of sentences."""
+
+    rng = random.Random(seed)
+    paragraphs = []
+    length = 0
+    while length < size:
+        sentences = []
+        for _ in range(rng.randint(2, 6)):
+            words = [rng.choice(_NAMES) if rng.random() < 0.05 else rng.choice(_SHOUTS) if rng.random() < 0.01
+                     else rng.choice(_WORDS) for _ in range(rng.randint(6, 25))]
+            sentence = " ".join(words)
+            sentences.append(sentence[0].upper() + sentence[1:] + rng.choice(_ENDINGS))
+        paragraphs.append(" ".join(sentences))
+        length += len(paragraphs[-1]) + 1
+    return "\n".join(paragraphs)[:size].rsplit(" ", 1)[0] + "."
+
+
+def synthetic_page(size: int, seed: int = 0) -> WebpageData:
+    """Returns annotated webpage data with a synthetic text of about **size** characters.
+
+    Every paragraph of the text starts with an external link.
+    """
+
+    text = synthetic_text(size, seed)
+    headline = "Shocking report: what the FBI found in New York?"
+    paragraphs = []
+    for number, paragraph in enumerate(text.split("\n")):
+        link = '<a href="https://source{}.example.org/article">{}</a>'.format(number % 50, paragraph[:20])
+        paragraphs.append("<p>{} {}</p>".format(link, paragraph[20:]))
+    html = "<html><head><title>{}</title></head><body><h1>{}</h1>{}</body></html>".format(
+        headline, headline, "".join(paragraphs))
+
+    doc = annotate(headline, text)
+    return WebpageData(html, headline, text, ["Jane Doe"], "https://www.example.com/news/article.html",
+                       sent_tokenize(text), word_tokenize(text, doc), word_tokenize(headline, doc), doc,
+                       parse_html(html))
+
+
+def measure(function: Callable[[], object], repeat: int) -> float:
+    """Returns the shortest of **repeat** durations of a function call in seconds."""
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def run_scaling(sizes: list[int] = None, signals: list[str] = None, repeat: int = 3) -> list[tuple[str, int, float]]:
+    """Measures parsing stages and signal evaluators on synthetic webpages of growing text size.
+
+    Shared page artifacts are reset before every evaluator call, so each signal's time includes the artifacts it uses.
+    Deadlines (see deadlines.py) are disabled during the measurement, as large texts are expected to exceed them.
+
+    :param sizes: Text sizes in characters, defaults to **SIZES**.
+    :param signals: Names of the signals to measure, defaults to all of **evaluation_signals**.
+    :param repeat: Number of measurements per stage and size, of which the shortest is kept.
+    :return: (stage, size, seconds) for every stage and size.
+    """
+
+    sizes = sizes or SIZES
+    signals = signals or list(evaluation_signals.keys())
+    model_registry.warmup()
+    # spaCy refuses texts longer than max_length by default
+    nlp = model_registry.get_spacy()
+    nlp.max_length = max(nlp.max_length, max(sizes) + 1000)
+
+    stage_deadlines, page_deadline = dict(deadlines.STAGE_DEADLINES), deadlines.PAGE_DEADLINE
+    for stage in list(stage_deadlines) + ["page"]:
+        deadlines.set_deadline(stage, None)
+
+    rows = []
+    try:
+        for size in sizes:
+            data = synthetic_page(size)
+            logger.warning("[Benchmark] Measuring {} characters".format(len(data.text)))
+            rows.append(("annotation", size, measure(lambda: annotate(data.headline, data.text), repeat)))
+            rows.append(("sentence_tokenization", size, measure(lambda: sent_tokenize(data.text), repeat)))
+            rows.append(("word_tokenization", size, measure(lambda: word_tokenize(data.text, data.doc), repeat)))
+            rows.append(("dom", size, measure(lambda: parse_html(data.html), repeat)))
+
+            for signal_name in signals:
+                evaluator = evaluation_signals[signal_name].evaluator
+
+                def evaluate():
+                    data.artifacts.clear()
+                    evaluator(data)
+
+                rows.append(("signal_" + signal_name, size, measure(evaluate, repeat)))
+    finally:
+        for stage, seconds in list(stage_deadlines.items()) + [("page", page_deadline)]:
+            deadlines.set_deadline(stage, seconds)
+    return rows
+
+
+def growth_exponents(rows: list[tuple[str, int, float]]) -> dict[str, float]:
+    """Returns each stage's empirical growth exponent, the slope of log(time) over log(size) between the two largest
+    sizes (1 for linear, 2 for quadratic growth)."""
+
+    exponents = {}
+    for stage in dict.fromkeys(stage for stage, _, _ in rows):
+        timings = sorted((size, seconds) for row_stage, size, seconds in rows if row_stage == stage)
+        if len(timings) >= 2:
+            (size_1, seconds_1), (size_2, seconds_2) = timings[-2:]
+            if seconds_1 > 0 and seconds_2 > 0:
+                exponents[stage] = math.log(seconds_2 / seconds_1) / math.log(size_2 / size_1)
+    return exponents
+
+
+def plot(rows: list[tuple[str, int, float]], path: Path):
+    """Plots time over text size for every stage on log-log axes, requires matplotlib."""
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    figure, axes = plt.subplots(figsize=(10, 7))
+    for stage in dict.fromkeys(stage for stage, _, _ in rows):
+        timings = sorted((size, seconds) for row_stage, size, seconds in rows if row_stage == stage)
+        axes.plot([size for size, _ in timings], [seconds for _, seconds in timings], marker="o", label=stage)
+    axes.set_xscale("log")
+    axes.set_yscale("log")
+    axes.set_xlabel("text size (characters)")
+    axes.set_ylabel("time (s)")
+    axes.legend(fontsize="x-small", ncol=2)
+    figure.savefig(path, dpi=120, bbox_inches="tight")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Time of parsing stages and signal evaluators over text size.")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="text sizes in characters")
+    arg_parser.add_argument("--signals", nargs="+", choices=list(evaluation_signals.keys()), metavar="SIGNAL",
+                            help="only measure these signals")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="measurements per stage and size (shortest is kept)")
+    arg_parser.add_argument("--plot", action="store_true", help="also plot the results (requires matplotlib)")
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    rows = run_scaling(sorted(args.sizes), args.signals, args.repeat)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / ("scaling_" + datetime.now().strftime("%Y-%m-%d_%Hh%Mm%Ss") + ".csv")
+    with open(path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file, delimiter=";")
+        writer.writerow(["stage", "size", "seconds"])
+        writer.writerows(rows)
+    print("Results written to " + str(path))
+
+    print("{:<45}{:>10}{:>12}".format("stage", "exponent", "max time (s)"))
+    for stage, exponent in growth_exponents(rows).items():
+        print("{:<45}{:>10.2f}{:>12.4f}{}".format(stage, exponent, max(s for r, _, s in rows if r == stage),
+                                                  "  SUPER-LINEAR" if exponent > SUPERLINEAR_EXPONENT else ""))
+
+    if args.plot:
+        try:
+            plot(rows, path.with_suffix(".png"))
+        except ImportError:
+            print("Plotting requires matplotlib")
+
+
+if __name__ == "__main__":
+    main()
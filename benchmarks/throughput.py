@@ -0,0 +1,143 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import model_registry
+import timing
+from benchmarks import corpus
+from scoring import credibility_evaluation
+from scoring.credibility_evaluation import evaluate_webpage
+
+# stored results compared against by default
+BASELINE_PATH = (Path(__file__).parent / "baseline.json").resolve()
+# relative slowdown (or memory increase) reported as regression
+TOLERANCE = 0.1
+
+logger = logging.getLogger("alpaca")
+
+
+def run_benchmark(limit: Optional[int] = None) -> dict:
+    """Evaluates all webpages of the snapshot corpus via parse_data -> evaluate_webpage, without network access.
+
+    Models are loaded before the measurement starts. Parsed page and sub-score caches should be disabled.
+
+    :param limit: Only evaluate the webpages of the first **limit** dataset URLs.
+    :return: Throughput, per-stage timings (see timing.timings_summary), peak memory and the score of every webpage.
+    """
+
+    urls = corpus.corpus_urls(limit=limit)
+    if not urls:
+        raise FileNotFoundError("No webpage snapshots in {}, build the corpus first".format(corpus.CORPUS_DIR))
+    corpus.use_corpus()
+
+    start = time.perf_counter()
+    model_registry.warmup()
+    warmup_seconds = time.perf_counter() - start
+
+    timing.clear_timings()
+    scores = {}
+    start = time.perf_counter()
+    for url in urls:
+        scores[url] = evaluate_webpage(url)
+    seconds = time.perf_counter() - start
+
+    stages = timing.timings_summary()
+    for summary in stages.values():
+        del summary["histogram"]
+    return {"pages": len(urls),
+            "failed_pages": sum(1 for score in scores.values() if score < 0),
+            "seconds": seconds,
+            "pages_per_second": len(urls) / seconds,
+            "warmup_seconds": warmup_seconds,
+            "peak_memory_mb": _peak_memory_mb(),
+            "signal_workers": credibility_evaluation.SIGNAL_WORKERS,
+            "stages": stages,
+            "scores": scores}
+
+
+def compare(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list[str]:
+    """Compares benchmark results against a baseline, prints a report and returns the detected regressions.
+
+    Throughput, mean stage durations and peak memory are regressions if they are worse by more than **tolerance**
+    (relative), changed webpage scores always are.
+    """
+
+    regressions = []
+
+    def check(name: str, value: Optional[float], baseline_value: Optional[float], higher_is_better: bool = False):
+        if value is None or not baseline_value:
+            return
+        change = value / baseline_value - 1
+        regressed = -change > tolerance if higher_is_better else change > tolerance
+        print("{:<40}{:>12.4f}{:>12.4f}{:>+9.1%}{}".format(name, baseline_value, value, change,
+                                                           "  REGRESSION" if regressed else ""))
+        if regressed:
+            regressions.append("{} {:+.1%}".format(name, change))
+
+    print("{:<40}{:>12}{:>12}{:>9}".format("", "baseline", "current", "change"))
+    check("pages_per_second", results["pages_per_second"], baseline.get("pages_per_second"), higher_is_better=True)
+    check("peak_memory_mb", results["peak_memory_mb"], baseline.get("peak_memory_mb"))
+    for stage, summary in results["stages"].items():
+        if stage in baseline.get("stages", {}):
+            check(stage + " (mean s)", summary["mean"], baseline["stages"][stage]["mean"])
+
+    changed = [url for url, score in results["scores"].items()
+               if url in baseline.get("scores", {}) and abs(score - baseline["scores"][url]) > 1e-9]
+    print("{} of {} webpage scores changed".format(len(changed), len(results["scores"])))
+    for url in changed:
+        print("  {:.5f} -> {:.5f} {}".format(baseline["scores"][url], results["scores"][url], url))
+    if changed:
+        regressions.append("{} changed scores".format(len(changed)))
+    return regressions
+
+
+def _peak_memory_mb() -> Optional[float]:
+    """Returns the peak resident memory of this process in MB, None if the platform doesn't report it."""
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS, in kilobytes elsewhere
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Offline throughput benchmark over the webpage snapshot corpus.")
+    arg_parser.add_argument("--build-corpus", action="store_true",
+                            help="download missing snapshots of the dataset URLs first (requires network access)")
+    arg_parser.add_argument("--limit", type=int, help="only use the first LIMIT dataset URLs")
+    arg_parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline results to compare against")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="store the results as new baseline")
+    arg_parser.add_argument("--output", type=Path, help="store the results in this json file")
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    if args.build_corpus:
+        corpus.build_corpus(limit=args.limit)
+
+    results = run_benchmark(args.limit)
+    print("{} webpages ({} failed) in {:.1f}s: {:.2f} pages/s, peak memory {} MB".format(
+        results["pages"], results["failed_pages"], results["seconds"], results["pages_per_second"],
+        "{:.0f}".format(results["peak_memory_mb"]) if results["peak_memory_mb"] is not None else "n/a"))
+
+    for path in [args.output, args.baseline if args.save_baseline else None]:
+        if path:
+            with open(path, "w", encoding="utf-8") as json_file:
+                json.dump(results, json_file, indent=2)
+
+    if not args.save_baseline and args.baseline.exists():
+        with open(args.baseline, "r", encoding="utf-8") as json_file:
+            regressions = compare(results, json.load(json_file))
+        if regressions:
+            print("Regressions: " + ", ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
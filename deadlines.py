@@ -0,0 +1,184 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from contextlib import contextmanager
+from typing import Callable, Optional, TypeVar
+
+# maximum duration of single stages of a webpage evaluation in seconds, None for no limit
+STAGE_DEADLINES: dict[str, Optional[float]] = {
+    "download":         30,     # downloading the webpage html
+    "extraction":       20,     # extracting text and metadata from the html
+    "annotation":       30,     # spaCy pass over headline and text
+    "language_tool":    25,     # LanguageTool check of headline and text
+    "signal":           30,     # evaluation of a single credibility signal
+}
+# maximum duration of a whole webpage evaluation (including download) in seconds, None for no limit
+PAGE_DEADLINE: Optional[float] = 120
+# maximum number of threads still running a stage after its deadline, further stages wait for one of them to finish
+MAX_ABANDONED_THREADS = 8
+# maximum number of idle threads kept for running further stages, see run_with_deadline()
+MAX_IDLE_THREADS = 16
+
+logger = logging.getLogger("alpaca")
+
+# (monotonic deadline, limit in seconds) of the webpage evaluated by the current thread, see page_deadline()
+_page = threading.local()
+# number of abandoned stage threads still running, see run_with_deadline()
+_abandoned_threads = 0
+_abandoned_condition = threading.Condition()
+# task queues of the idle stage threads
+_idle_threads: list[queue.SimpleQueue] = []
+_idle_lock = threading.Lock()
+
+T = TypeVar("T")
+
+
+class StageTimeout(Exception):
+    """Raised when a stage of a webpage evaluation exceeds its deadline, or the page deadline is exceeded.
+
+    :param stage: Name of the stage, "page" if the page deadline was exceeded.
+    :param seconds: The exceeded time limit.
+    """
+
+    def __init__(self, stage: str, seconds: float):
+        super().__init__("{} exceeded its deadline of {:.1f}s".format(stage, seconds))
+        self.stage = stage
+        self.seconds = seconds
+
+
+def set_deadline(stage: str, seconds: Optional[float]):
+    """Set the deadline of a stage (see **STAGE_DEADLINES**) or of whole webpages ("page"). None for no limit."""
+
+    global PAGE_DEADLINE
+    if stage == "page":
+        PAGE_DEADLINE = seconds
+    else:
+        STAGE_DEADLINES[stage] = seconds
+
+
+@contextmanager
+def page_deadline(seconds: Optional[float] = None):
+    """Context manager limiting the evaluation of a webpage by the current thread to **PAGE_DEADLINE** seconds.
+
+    Stages run via run_with_deadline() within the context are cut short once the page deadline has passed.
+
+    :param seconds: Overrides **PAGE_DEADLINE**.
+    """
+
+    seconds = PAGE_DEADLINE if seconds is None else seconds
+    previous = getattr(_page, "deadline", None)
+    _page.deadline = (time.monotonic() + seconds, seconds) if seconds is not None else None
+    try:
+        yield
+    finally:
+        _page.deadline = previous
+
+
+def time_left() -> Optional[float]:
+    """Returns the seconds left until the current thread's page deadline, None if there is none."""
+
+    deadline = getattr(_page, "deadline", None)
+    return None if deadline is None else deadline[0] - time.monotonic()
+
+
+def check_page_deadline():
+    """Raises StageTimeout if the current thread's page deadline has passed."""
+
+    remaining = time_left()
+    if remaining is not None and remaining <= 0:
+        raise StageTimeout("page", _page.deadline[1])
+
+
+def run_with_deadline(stage: str, function: Callable[..., T], *args, **kwargs) -> T:
+    """Runs a stage of a webpage evaluation, raising StageTimeout if it exceeds its own or the page deadline.
+
+    With a deadline, the function runs in a separate daemon thread which is abandoned on timeout (Python threads can't
+    be cancelled), so the calling worker is free to continue. Threads are reused for later stages once they finish,
+    so thread-local resources (e.g. database connections) are reused as well. Thread-local state of the caller such
+    as active statistics captures (see stats_collector.capture_results) is not visible to the function.
+
+    Abandoned threads keep using CPU until they finish, so at most **MAX_ABANDONED_THREADS** of them may run at once.
+    While the limit is reached, stages wait (within their deadline) for an abandoned thread to finish before starting.
+    """
+
+    global _abandoned_threads
+    check_page_deadline()
+    stage_seconds = STAGE_DEADLINES.get(stage)
+    remaining = time_left()
+    if stage_seconds is None and remaining is None:
+        return function(*args, **kwargs)
+
+    if remaining is not None and (stage_seconds is None or remaining < stage_seconds):
+        timeout, timed_out = remaining, StageTimeout("page", _page.deadline[1])
+    else:
+        timeout, timed_out = stage_seconds, StageTimeout(stage, stage_seconds)
+
+    start = time.monotonic()
+    with _abandoned_condition:
+        if not _abandoned_condition.wait_for(lambda: _abandoned_threads < MAX_ABANDONED_THREADS, timeout):
+            logger.warning("[Deadlines] {} abandoned threads still running, {} not started".format(
+                _abandoned_threads, stage))
+            raise timed_out
+    timeout -= time.monotonic() - start
+
+    future = Future()
+    abandoned = threading.Event()
+
+    def run():
+        global _abandoned_threads
+        try:
+            future.set_result(function(*args, **kwargs))
+        except BaseException as err:
+            future.set_exception(err)
+        finally:
+            with _abandoned_condition:
+                if abandoned.is_set():
+                    _abandoned_threads -= 1
+                    _abandoned_condition.notify()
+
+    _run_in_stage_thread(run)
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        with _abandoned_condition:
+            finished = future.done()
+            if not finished:
+                abandoned.set()
+                _abandoned_threads += 1
+            count = _abandoned_threads
+        if finished:
+            # finished just in time, or the function raised TimeoutError itself
+            return future.result()
+        logger.warning("[Deadlines] Abandoned {} thread after {:.1f}s, {} abandoned threads running".format(
+            stage, timed_out.seconds, count))
+        raise timed_out from None
+
+
+def _run_in_stage_thread(task: Callable[[], None]):
+    """Runs a task in an idle stage thread, or in a new one if none is idle."""
+
+    with _idle_lock:
+        tasks = _idle_threads.pop() if _idle_threads else None
+    if tasks is None:
+        tasks = queue.SimpleQueue()
+        threading.Thread(target=_stage_thread, args=(tasks,), name="deadline-stage", daemon=True).start()
+    tasks.put(task)
+
+
+def _stage_thread(tasks: queue.SimpleQueue):
+    """Runs the tasks given to a stage thread, waiting for the next one while idle (up to **MAX_IDLE_THREADS**)."""
+
+    while True:
+        tasks.get()()
+        with _idle_lock:
+            if len(_idle_threads) >= MAX_IDLE_THREADS:
+                return
+            _idle_threads.append(tasks)
+
+
+def abandoned_threads() -> int:
+    """Returns the number of threads still running a stage after its deadline."""
+
+    return _abandoned_threads
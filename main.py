@@ -1,17 +1,51 @@
+import argparse
 import atexit
+import json
 import logging
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Iterator, Optional, TextIO
 
-import stats_collector
-from parsing.webpage_parser import valid_address
-from scoring.credibility_evaluation import evaluate_webpage
+# reference point for measuring time to first score, taken before the project imports below
+_START_TIME = time.perf_counter()
 
-# additional signal statistics for processed webpages, exported as csv file
+import model_registry  # noqa: E402
+import stats_collector  # noqa: E402
+import timing  # noqa: E402
+from parsing import fetch_cache, page_cache  # noqa: E402
+from scoring import score_cache  # noqa: E402
+from parsing.webpage_parser import valid_address  # noqa: E402
+from scoring.credibility_evaluation import evaluate_webpage  # noqa: E402
+
+# additional signal statistics for processed webpages, exported as csv file (with stage timings as json file)
 COLLECT_STATS = False
 
-# logging output settings per stream (None = disabled)
+# store downloaded webpages in a persistent cache (.cache/fetch), and optionally only serve webpages from the cache
+CACHE_FETCHED_PAGES = False
+OFFLINE_MODE = False
+
+# record all fetched webpages in an archive (.cache/archive), or replay webpages from it without network access
+RECORD_PAGES = False
+REPLAY_PAGES = False
+
+# store parsed and tokenized webpages in a persistent cache (.cache/pages)
+CACHE_PARSED_PAGES = False
+
+# store signal sub-scores in a persistent cache (.cache/subscores.sqlite), only changed signals are recomputed
+CACHE_SUBSCORES = False
+
+# load all models on startup instead of on first use (slower start, but no delay for the first webpage)
+WARMUP_MODELS = False
+
+# error names of negative credibility scores in JSONL output, see evaluate_webpage
+SCORE_ERRORS = {-1: "parsing failed", -2: "evaluation failed", -3: "deadline exceeded"}
+
+# logging output settings per stream (None = disabled, console output goes to stderr)
 LOG_LEVEL_CONSOLE = logging.WARNING
 LOG_LEVEL_FILE = logging.DEBUG
 
@@ -32,6 +66,17 @@ if LOG_LEVEL_FILE:
     filehandler.setLevel(LOG_LEVEL_FILE)
     logger.addHandler(filehandler)
 
+if CACHE_FETCHED_PAGES or OFFLINE_MODE:
+    fetch_cache.enable_fetch_cache(offline=OFFLINE_MODE)
+if RECORD_PAGES:
+    fetch_cache.enable_recording()
+elif REPLAY_PAGES:
+    fetch_cache.enable_replay()
+if CACHE_PARSED_PAGES:
+    page_cache.enable_page_cache()
+if CACHE_SUBSCORES:
+    score_cache.enable_score_cache()
+
 
 def alpaca_init():
     """If a valid webpage URL is submitted, retrieves and prints the webpage's credibility score.
@@ -47,6 +92,10 @@ def alpaca_init():
         stats_collector.set_stats_collection(True)
         atexit.register(stats_collector.results_to_csv)
 
+    if WARMUP_MODELS:
+        model_registry.warmup()
+    logger.info("[Main] Startup time: {:.3f}s".format(time.perf_counter() - _START_TIME))
+
     while True:
         user_input = input("\nEnter webpage address: ")
 
@@ -55,6 +104,7 @@ def alpaca_init():
 
         if valid_address(user_input):
             score = evaluate_webpage(user_input)
+            _log_time_to_first_score()
             if 0 <= score <= 1:
                 print("Webpage credibility score: {:.5f} for {}".format(score, user_input))
             else:
@@ -63,35 +113,237 @@ def alpaca_init():
             print("Invalid address")
 
 
-def evaluate_datasets():
+def evaluate_datasets(workers: int = 1):
     """Evaluates credibility of and collects signal statistics for all URLs in the performance analysis datasets.
 
     The datasets are expected as semicolon-separated list of URLs and credibility/fake news classification ratings,
     with the first line in each file being the column headers.
+
+    :param workers: Number of worker processes evaluating webpages in parallel. With 1, webpages are evaluated in the
+        main process one after another. Collected statistics and csv output are the same either way.
     """
 
     logger.info("[Main] Evaluating datasets")
     stats_collector.set_stats_collection(True)
     directory = (Path(__file__).parent / "analysis/datasets").resolve()
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=stats_collector.set_stats_collection,
+                                       initargs=(True,))
+
+    try:
+        for dataset in directory.glob("*"):
+            logger.info("[Main] Evaluating dataset " + str(dataset))
+            entries = _read_dataset(dataset)
 
-    for dataset in directory.glob("*"):
-        logger.info("[Main] Evaluating dataset " + str(dataset))
-        with open(dataset, "r") as datasetIO:
-            for line in datasetIO.readlines()[1:]:  # first line is column headers
-                url = line.split(";")[0]
-                rating = float(line.split(";")[1])
-                if not valid_address(url):
-                    url = "http://" + url
+            if executor:
+                evaluations = executor.map(_evaluate_in_worker, [url for url, _ in entries])
 
+            for url, rating in entries:
                 stats_collector.add_result(url, "rating", rating)
-                score = evaluate_webpage(url)
+                if executor:
+                    score, url_stats, url_timings = next(evaluations)
+                    stats_collector.add_results(url, url_stats)
+                    timing.add_timings(url_timings)
+                else:
+                    score = evaluate_webpage(url)
+                _log_time_to_first_score()
                 print("Webpage score: {:.5f} for {}".format(score, url))
 
-        stats_collector.results_to_csv()
-        stats_collector.clear_results()
-        print("Finished dataset " + str(dataset))
-        print()
+            stats_collector.results_to_csv()
+            stats_collector.clear_results()
+            timing.clear_timings()
+            print("Finished dataset " + str(dataset))
+            print()
+    finally:
+        if executor:
+            executor.shutdown()
+
+
+def evaluate_jsonl(lines: Iterable[str], output: TextIO, workers: int = 1, threshold: float = None):
+    """Evaluates webpages given as JSON lines, writing one JSON line with the result per webpage as soon as it is done.
+
+    Each input line is an object with the webpage's "url", and optionally its "html" (which is then not downloaded).
+    Each output line holds "url", the credibility "score", the signal "subscores" and the "timings" of the evaluation
+    stages in seconds. With a **threshold**, it holds the score "bound" and whether the webpage is "above_threshold"
+    instead of the score. Webpages that could not be evaluated produce an output line with "url" and "error" (plus the
+    "score" error code if evaluate_webpage returned one), invalid input lines one with "line" and "error". Input is
+    consumed lazily and at most twice **workers** webpages are evaluated at once, so memory use stays constant
+    regardless of the input size (unless **COLLECT_STATS** is enabled).
+
+    :param lines: Input lines, e.g. sys.stdin.
+    :param output: Stream the results are written to, e.g. sys.stdout.
+    :param workers: Number of worker processes. With 1, webpages are evaluated in this process, in input order.
+    :param threshold: Credibility threshold for threshold classification, see evaluate_webpage.
+    """
+
+    if workers <= 1:
+        for record in _read_jsonl(lines):
+            _write_result(output, _evaluate_record(*record, threshold) if isinstance(record, tuple) else record)
+        return
+
+    def create_executor() -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=workers, initializer=stats_collector.set_stats_collection,
+                                   initargs=(stats_collector.stats_collection_enabled(),))
+
+    def submit(record: tuple[str, Optional[str]]):
+        nonlocal executor
+        try:
+            future = executor.submit(_evaluate_record, *record, threshold)
+        except BrokenProcessPool:
+            executor.shutdown(wait=False, cancel_futures=True)
+            executor = create_executor()
+            future = executor.submit(_evaluate_record, *record, threshold)
+        pending[future] = (record[0], executor)
+
+    def write_finished():
+        nonlocal executor
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            url, future_executor = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as err:
+                # e.g. a worker process crashed, which fails all webpages it was evaluating
+                result = _error_result(url, err)
+                if isinstance(err, BrokenProcessPool) and future_executor is executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = create_executor()
+            _write_result(output, result)
+
+    executor = create_executor()
+    # URL and executor of the webpages being evaluated, by future
+    pending = {}
+    try:
+        for record in _read_jsonl(lines):
+            if not isinstance(record, tuple):
+                _write_result(output, record)
+                continue
+            if len(pending) >= 2 * workers:
+                write_finished()
+            submit(record)
+        while pending:
+            write_finished()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _read_jsonl(lines: Iterable[str]) -> Iterator:
+    """Yields (URL, html or None) per valid input line, and an error result for every invalid one.
+
+    A null "html" is treated like a missing one.
+    """
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict) or not isinstance(record.get("url"), str):
+                raise ValueError("expected an object with a url")
+            if record.get("html") is not None and not isinstance(record["html"], str):
+                raise ValueError("html must be a string")
+        except ValueError as err:
+            yield {"line": number, "error": "invalid input: " + str(err)}
+            continue
+        yield record["url"], record.get("html")
+
+
+def _evaluate_record(url: str, html: str = None, threshold: float = None) -> dict:
+    """Evaluates a webpage (e.g. in a worker process), returns its JSONL result with the statistics and stage timing
+    histograms collected for it, see _write_result."""
+
+    # set aside timings collected before, so that only this webpage's are returned
+    previous_histograms = timing.pop_timings()
+    page_stats = {}
+    try:
+        with stats_collector.capture_results() as page_stats:
+            score = evaluate_webpage(url, html, threshold)
+    except Exception as err:
+        result = _error_result(url, err)
+    else:
+        if score in SCORE_ERRORS:
+            result = {"url": url, "score": score, "error": SCORE_ERRORS[score]}
+        elif threshold is not None:
+            # the bound lies on the same side of the threshold as the exact score
+            result = {"url": url, "bound": score, "above_threshold": score >= threshold}
+        else:
+            result = {"url": url, "score": score}
+    histograms = timing.pop_timings()
+    timing.add_timings(previous_histograms)
+
+    result["subscores"] = {field[len("score_"):]: value for field, value in page_stats.items()
+                           if field.startswith("score_")}
+    result["timings"] = {stage: histogram.total for stage, histogram in histograms.items()}
+    result["histograms"] = histograms
+    result["stats"] = stats_collector.pop_results(url)
+    return result
+
+
+def _error_result(url: str, err: Exception) -> dict:
+    """Returns the JSONL result of a webpage whose evaluation raised an exception."""
+
+    logger.error("[Main] Evaluation of {} failed: {!r}".format(url, err))
+    return {"url": url, "error": "evaluation failed: {!r}".format(err)}
+
+
+def _write_result(output: TextIO, result: dict):
+    """Writes a result as JSON line, adding the statistics and timing histograms collected for it to this process."""
+
+    timing.add_timings(result.pop("histograms", {}))
+    if "stats" in result:
+        stats_collector.add_results(result["url"], result.pop("stats"))
+    output.write(json.dumps(result) + "\n")
+    output.flush()
+
+
+def _read_dataset(dataset: Path) -> list[tuple[str, float]]:
+    """Reads a performance analysis dataset file, returns its URLs and their credibility ratings."""
+
+    entries = []
+    with open(dataset, "r") as datasetIO:
+        for line in datasetIO.readlines()[1:]:  # first line is column headers
+            url = line.split(";")[0]
+            rating = float(line.split(";")[1])
+            if not valid_address(url):
+                url = "http://" + url
+            entries.append((url, rating))
+    return entries
+
+
+def _evaluate_in_worker(url: str) -> tuple[float, dict[str, float], dict[str, timing.LatencyHistogram]]:
+    """Evaluates a webpage in a worker process, returns its score and the signal statistics and timings collected."""
+
+    score = evaluate_webpage(url)
+    return score, stats_collector.pop_results(url), timing.pop_timings()
+
+
+def _log_time_to_first_score():
+    """Logs the time from program start to the first computed webpage score (only once per run)."""
+
+    global _START_TIME
+    if _START_TIME is not None:
+        logger.info("[Main] Time to first score: {:.3f}s".format(time.perf_counter() - _START_TIME))
+        _START_TIME = None
 
 
 if __name__ == "__main__":
-    alpaca_init()
+    arg_parser = argparse.ArgumentParser(description="Evaluates the credibility of webpages. Without arguments, "
+                                                     "webpage URLs are read interactively.")
+    arg_parser.add_argument("--jsonl", action="store_true",
+                            help="read webpages as JSON lines ({\"url\": ...} or {\"url\": ..., \"html\": ...}) from "
+                                 "stdin and write one JSON result line per webpage to stdout")
+    arg_parser.add_argument("--workers", type=int, default=1, help="number of worker processes in JSONL mode")
+    arg_parser.add_argument("--threshold", type=float,
+                            help="only classify webpages as above or below this credibility threshold in JSONL mode")
+    args = arg_parser.parse_args()
+
+    if args.jsonl:
+        if COLLECT_STATS:
+            stats_collector.set_stats_collection(True)
+            atexit.register(stats_collector.results_to_csv)
+        if WARMUP_MODELS:
+            model_registry.warmup()
+        evaluate_jsonl(sys.stdin, sys.stdout, args.workers, args.threshold)
+    else:
+        alpaca_init()
@@ -0,0 +1,122 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+    from spacy.tokens import Doc
+
+# spaCy model shared by all consumers
+SPACY_MODEL = "en_core_web_sm"
+# pipeline components no consumer needs, excluded when loading the model (sentence boundaries come from the
+# lightweight senter component instead of the parser)
+SPACY_EXCLUDE = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+# components that have to run whenever the component they are mapped to is enabled
+SPACY_DEPENDENCIES = {"ner": ["tok2vec"]}
+
+logger = logging.getLogger("alpaca")
+
+# heavyweight resources are created by their registered loader on first use
+_loaders: dict[str, Callable[[], Any]] = {}
+_resources: dict[str, Any] = {}
+_load_locks = defaultdict(threading.Lock)
+_registry_lock = threading.Lock()
+
+
+def register(name: str, loader: Callable[[], Any]):
+    """Registers a loader function for a heavyweight resource, which is only called once the resource is first used.
+
+    :param name: Name to retrieve the resource by via get().
+    :param loader: Function without arguments that creates the resource. Expensive imports belong inside it.
+    """
+
+    with _registry_lock:
+        _loaders[name] = loader
+
+
+def get(name: str) -> Any:
+    """Returns the named process-wide resource, loading it on first use (thread-safe)."""
+
+    if name in _resources:
+        return _resources[name]
+
+    with _registry_lock:
+        if name not in _loaders:
+            raise KeyError("No loader registered for resource " + name)
+        load_lock = _load_locks[name]
+
+    with load_lock:
+        if name not in _resources:
+            start = time.perf_counter()
+            _resources[name] = _loaders[name]()
+            logger.debug("[Models] Loaded {} in {:.3f}s".format(name, time.perf_counter() - start))
+    return _resources[name]
+
+
+def is_loaded(name: str) -> bool:
+    """Returns True if the named resource has already been loaded."""
+
+    return name in _resources
+
+
+def warmup(*names: str):
+    """Loads the given resources (all registered resources if none are given) up front instead of on first use.
+
+    Resources are only registered once their consumer module has been imported, so long-running services should call
+    this after importing scoring.credibility_evaluation.
+    """
+
+    start = time.perf_counter()
+    for name in names or list(_loaders.keys()):
+        get(name)
+    logger.info("[Models] Warmup finished in {:.3f}s".format(time.perf_counter() - start))
+
+
+def _load_spacy() -> "Language":
+    """Loads the spaCy model without the components listed in **SPACY_EXCLUDE**, adding TextBlob sentiment.
+
+    The senter component is disabled in the model by default, as the parser usually sets sentence boundaries.
+    """
+
+    import spacy
+    from spacytextblob.spacytextblob import SpacyTextBlob  # registers the "spacytextblob" pipeline component
+
+    nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+    if "senter" in nlp.disabled:
+        nlp.enable_pipe("senter")
+    nlp.add_pipe("spacytextblob")
+    return nlp
+
+
+register("spacy", _load_spacy)
+
+
+def get_spacy() -> "Language":
+    """Returns the process-wide spaCy pipeline. Consumers should usually obtain a restricted view via spacy_view()."""
+
+    return get("spacy")
+
+
+class SpacyView:
+    """Callable view on the shared spaCy pipeline which only runs the given components.
+
+    :param components: Names of the pipeline components to run, their dependencies are enabled automatically.
+    """
+
+    def __init__(self, *components: str):
+        self.components = set(components)
+        for component in components:
+            self.components.update(SPACY_DEPENDENCIES.get(component, []))
+
+    def __call__(self, text: str) -> "Doc":
+        nlp = get_spacy()
+        disabled = [name for name in nlp.pipe_names if name not in self.components]
+        return nlp(text, disable=disabled)
+
+
+def spacy_view(*components: str) -> SpacyView:
+    """Returns a view on the shared spaCy pipeline running only the given components (e.g. "ner")."""
+
+    return SpacyView(*components)
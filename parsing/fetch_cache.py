@@ -0,0 +1,306 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# default location, lifetime (seconds) and maximum size (bytes of compressed html) of the fetch cache
+FETCH_CACHE_DIR = (Path(__file__).parent.parent / ".cache/fetch/").resolve()
+FETCH_CACHE_TTL = 30 * 24 * 60 * 60
+FETCH_CACHE_MAX_SIZE = 2 * 1024 ** 3
+# fraction of the maximum size a full cache is shrunk to, so that eviction only runs every once in a while
+FETCH_CACHE_EVICTION_TARGET = 0.9
+# number of writes after which the size estimate is recounted from disk, to notice writes by other processes
+FETCH_CACHE_RECOUNT_PUTS = 1000
+# default location of the archive of recorded webpages, see enable_recording() and enable_replay()
+ARCHIVE_DIR = (Path(__file__).parent.parent / ".cache/archive/").resolve()
+
+logger = logging.getLogger("alpaca")
+
+# enable via enable_fetch_cache()
+_cache = None
+_offline = False
+# enable via enable_recording() or enable_replay()
+_archive = None
+_replay = False
+
+
+class FetchCache:
+    """Persistent store of downloaded webpage html on disk.
+
+    Entries are keyed by normalised URL and hold the response metadata, the html itself is stored gzip-compressed and
+    content-addressed (by its SHA-256 hash), so identical responses for different URLs are only stored once.
+
+    :param directory: Directory holding the cache.
+    :param ttl: Seconds after which entries expire, None for no expiry.
+    :param max_size: Maximum total size of the stored (compressed) html in bytes, None for no limit. Least recently
+        used entries are evicted first when the limit is exceeded, until **FETCH_CACHE_EVICTION_TARGET** of it is
+        used. The total size is tracked incrementally, so writes don't scan the cache.
+    """
+
+    def __init__(self, directory: Path, ttl: Optional[float] = None, max_size: Optional[int] = None):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries_dir = self.directory / "entries"
+        self.objects_dir = self.directory / "objects"
+        os.makedirs(self.entries_dir, exist_ok=True)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        # estimated total size of the stored html and writes since it was last counted, see put()
+        self._size = None
+        self._puts = 0
+
+    def get(self, url: str, allow_expired: bool = False) -> Optional[str]:
+        """Returns the cached html for a URL, or None if it is not cached (or expired, unless **allow_expired**)."""
+
+        entry_path = self._entry_path(url)
+        metadata = self._read_entry(entry_path)
+        if metadata is None:
+            return None
+
+        if self.ttl is not None and time.time() - metadata["fetched"] > self.ttl:
+            if not allow_expired:
+                logger.debug("[Fetch cache] Expired entry for " + url)
+                return None
+            logger.debug("[Fetch cache] Using expired entry for " + url)
+
+        try:
+            with gzip.open(self._object_path(metadata["content_hash"]), "rt", encoding="utf-8") as object_file:
+                html = object_file.read()
+        except OSError:
+            return None
+
+        # entry modification time marks the last access for LRU eviction, the entry may have been evicted meanwhile
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return html
+
+    def metadata(self, url: str) -> Optional[dict]:
+        """Returns the stored response metadata for a URL, or None if it is not cached."""
+
+        return self._read_entry(self._entry_path(url))
+
+    def put(self, url: str, html: str, metadata: dict = None):
+        """Stores the html downloaded for a URL, together with additional response metadata."""
+
+        content = html.encode("utf-8")
+        content_hash = hashlib.sha256(content).hexdigest()
+        object_path = self._object_path(content_hash)
+        new_object = not object_path.exists()
+        if new_object:
+            self._write_atomic(object_path, gzip.compress(content))
+
+        entry = {"url": url,
+                 "normalized_url": normalize_url(url),
+                 "content_hash": content_hash,
+                 "fetched": time.time(),
+                 "length": len(html),
+                 "compressed_size": object_path.stat().st_size}
+        entry.update(metadata or {})
+        self._write_atomic(self._entry_path(url), json.dumps(entry).encode("utf-8"))
+
+        if self.max_size is not None:
+            self._puts += 1
+            if self._size is None or self._puts >= FETCH_CACHE_RECOUNT_PUTS:
+                self._size = self._stored_size()
+                self._puts = 0
+            elif new_object:
+                self._size += entry["compressed_size"]
+            if self._size > self.max_size:
+                self.evict(int(self.max_size * FETCH_CACHE_EVICTION_TARGET))
+
+    def evict(self, max_size: int):
+        """Removes least recently used entries until the stored html takes up at most **max_size** bytes.
+
+        Stored html no entry refers to any more (e.g. replaced when a URL was downloaded again) is removed first.
+        """
+
+        start = time.time()
+        entries = []
+        for entry_path in self.entries_dir.glob("*.json"):
+            metadata = self._read_entry(entry_path)
+            if metadata is not None:
+                entries.append((entry_path.stat().st_mtime, entry_path, metadata["content_hash"]))
+        entries.sort()
+
+        references = {}
+        for _, _, content_hash in entries:
+            references[content_hash] = references.get(content_hash, 0) + 1
+
+        total_size = 0
+        with os.scandir(self.objects_dir) as object_files:
+            for object_file in object_files:
+                if not object_file.name.endswith(".html.gz"):
+                    continue
+                try:
+                    stat = object_file.stat()
+                except OSError:
+                    continue
+                # html written after eviction started may belong to an entry that is being stored concurrently
+                if object_file.name[:-len(".html.gz")] not in references and stat.st_mtime < start:
+                    Path(object_file.path).unlink(missing_ok=True)
+                    logger.debug("[Fetch cache] Removed unreferenced " + object_file.name)
+                else:
+                    total_size += stat.st_size
+
+        for _, entry_path, content_hash in entries:
+            if total_size <= max_size:
+                break
+            entry_path.unlink(missing_ok=True)
+            references[content_hash] -= 1
+            if not references[content_hash]:
+                total_size -= self._object_size(content_hash)
+                self._object_path(content_hash).unlink(missing_ok=True)
+                logger.debug("[Fetch cache] Evicted " + content_hash)
+        self._size = total_size
+
+    def clear(self):
+        """Removes all entries and stored html from the cache."""
+
+        for path in list(self.entries_dir.glob("*")) + list(self.objects_dir.glob("*")):
+            path.unlink(missing_ok=True)
+
+    def _entry_path(self, url: str) -> Path:
+        return self.entries_dir / (hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest() + ".json")
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self.objects_dir / (content_hash + ".html.gz")
+
+    def _stored_size(self) -> int:
+        """Returns the total size of the stored html, without reading any entries."""
+
+        total_size = 0
+        with os.scandir(self.objects_dir) as object_files:
+            for object_file in object_files:
+                if object_file.name.endswith(".html.gz"):
+                    try:
+                        total_size += object_file.stat().st_size
+                    except OSError:
+                        pass
+        return total_size
+
+    def _object_size(self, content_hash: str) -> int:
+        try:
+            return self._object_path(content_hash).stat().st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _read_entry(entry_path: Path) -> Optional[dict]:
+        try:
+            with open(entry_path, "r", encoding="utf-8") as entry_file:
+                return json.load(entry_file)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _write_atomic(path: Path, content: bytes):
+        """Writes a file via a temporary file, so concurrent readers never see partial content."""
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                temp_file.write(content)
+            os.replace(temp_path, path)
+        except OSError:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+
+def normalize_url(url: str) -> str:
+    """Normalises a URL for use as cache key: lower-case scheme and host, no default port, no fragment."""
+
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def enable_fetch_cache(directory: Path = FETCH_CACHE_DIR,
+                       ttl: Optional[float] = FETCH_CACHE_TTL,
+                       max_size: Optional[int] = FETCH_CACHE_MAX_SIZE,
+                       offline: bool = False):
+    """Enables the persistent cache for downloaded webpages.
+
+    :param directory: Directory holding the cache.
+    :param ttl: Seconds after which cached webpages are downloaded again, None for no expiry.
+    :param max_size: Maximum size of the cache in bytes, None for no limit.
+    :param offline: If True, webpages are only served from the cache (including expired entries) and never downloaded.
+    """
+
+    global _cache, _offline
+    _cache = FetchCache(directory, ttl, max_size)
+    _offline = offline
+
+
+def disable_fetch_cache():
+    """Disables the fetch cache, webpages are downloaded on every request again."""
+
+    global _cache, _offline
+    _cache = None
+    _offline = False
+
+
+def get_fetch_cache() -> Optional[FetchCache]:
+    """Returns the active fetch cache, or None if caching is disabled."""
+
+    return _cache
+
+
+def offline_mode() -> bool:
+    """Returns True if webpages must only be served from the fetch cache."""
+
+    return _offline
+
+
+def enable_recording(directory: Path = ARCHIVE_DIR):
+    """Records the html of every fetched webpage in an archive, for later replay (see enable_replay).
+
+    Unlike the fetch cache, the archive never expires or evicts webpages. Recording a webpage again replaces it.
+
+    :param directory: Directory holding the archive.
+    """
+
+    global _archive, _replay
+    _archive = FetchCache(directory)
+    _replay = False
+
+
+def enable_replay(directory: Path = ARCHIVE_DIR):
+    """Serves all webpages from an archive recorded earlier, webpages missing from it are never downloaded.
+
+    :param directory: Directory holding the archive.
+    """
+
+    global _archive, _replay
+    _archive = FetchCache(directory)
+    _replay = True
+
+
+def disable_archive():
+    """Stops recording or replaying webpages."""
+
+    global _archive, _replay
+    _archive = None
+    _replay = False
+
+
+def get_archive() -> Optional[FetchCache]:
+    """Returns the archive webpages are recorded in or replayed from, or None if neither is enabled."""
+
+    return _archive
+
+
+def replay_mode() -> bool:
+    """Returns True if webpages must only be served from the archive."""
+
+    return _replay
@@ -0,0 +1,106 @@
+import gzip
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import model_registry
+from parsing.webpage_data import WebpageData
+
+# default location of the parsed page cache
+PAGE_CACHE_DIR = (Path(__file__).parent.parent / ".cache/pages/").resolve()
+
+logger = logging.getLogger("alpaca")
+
+# enable via enable_page_cache()
+_cache = None
+
+
+class PageCache:
+    """Persistent store of parsed and tokenized webpages on disk.
+
+    Stores headline, text, authors, tokenized sentences and words and the serialised spaCy document of a webpage,
+    keyed by the hash of its html and the parser version, so that extraction and tokenization only run once per html.
+
+    :param directory: Directory holding the cache.
+    :param parser_version: Version of the parsing code, cached pages of other versions are ignored.
+    """
+
+    def __init__(self, directory: Path, parser_version: int):
+        self.directory = Path(directory)
+        self.parser_version = parser_version
+        os.makedirs(self.directory, exist_ok=True)
+
+    def load(self, url: str, html: str) -> Optional[WebpageData]:
+        """Returns the cached webpage data for the given html, or None if it is not cached."""
+
+        from spacy.tokens import Doc
+
+        from parsing.webpage_parser import parse_html
+
+        try:
+            with gzip.open(self._path(html), "rb") as page_file:
+                fields = pickle.load(page_file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        doc = Doc(model_registry.get_spacy().vocab).from_bytes(fields["doc"])
+        return WebpageData(html, fields["headline"], fields["text"], fields["authors"], url, fields["text_sentences"],
+                           fields["text_words"], fields["headline_words"], doc, parse_html(html))
+
+    def store(self, data: WebpageData):
+        """Stores parsed webpage data, keyed by its html."""
+
+        fields = {"headline": data.headline,
+                  "text": data.text,
+                  "authors": data.authors,
+                  "text_sentences": data.text_sentences,
+                  "text_words": data.text_words,
+                  "headline_words": data.headline_words,
+                  "doc": data.doc.to_bytes()}
+        path = self._path(data.html)
+
+        # write via temporary file, so concurrent readers never see partial content
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                temp_file.write(gzip.compress(pickle.dumps(fields, protocol=pickle.HIGHEST_PROTOCOL)))
+            os.replace(temp_path, path)
+        except OSError as err:
+            Path(temp_path).unlink(missing_ok=True)
+            logger.warning("[Page cache] Could not store parsed page: " + str(err))
+
+    def clear(self):
+        """Removes all cached pages."""
+
+        for path in self.directory.glob("*"):
+            path.unlink(missing_ok=True)
+
+    def _path(self, html: str) -> Path:
+        key = hashlib.sha256("{}\n{}".format(self.parser_version, html).encode("utf-8")).hexdigest()
+        return self.directory / (key + ".pkl.gz")
+
+
+def enable_page_cache(directory: Path = PAGE_CACHE_DIR):
+    """Enables the persistent cache for parsed and tokenized webpages."""
+
+    from parsing.webpage_parser import PARSER_VERSION
+
+    global _cache
+    _cache = PageCache(directory, PARSER_VERSION)
+
+
+def disable_page_cache():
+    """Disables the parsed page cache."""
+
+    global _cache
+    _cache = None
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """Returns the active parsed page cache, or None if caching is disabled."""
+
+    return _cache
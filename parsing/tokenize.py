@@ -1,12 +1,34 @@
-import nltk
+from typing import TYPE_CHECKING
+
 import regex as re
-import spacy
 
-nlp = spacy.load("en_core_web_sm")
+from model_registry import spacy_view
+
+if TYPE_CHECKING:
+    from spacy.tokens import Doc
+
+# shared spaCy pipeline views: full page annotation and named entities only
+annotation_nlp = spacy_view("ner", "senter", "spacytextblob")
+ner_nlp = spacy_view("ner")
+
+
+def annotate(headline: str, text: str) -> "Doc":
+    """Runs the spaCy pipeline (including TextBlob sentiment) once over a webpage's headline and text.
 
+    The returned document covers headline and text separated by a line break, so it can be shared by all evaluators
+    that need named entities, sentence boundaries or sentiment information.
+    """
 
-def word_tokenize(text: str) -> list[str]:
-    """Tokenizes text into words. Keeps full stops with abbreviations."""
+    return annotation_nlp(headline + "\n" + text)
+
+
+def word_tokenize(text: str, doc: "Doc" = None) -> list[str]:
+    """Tokenizes text into words. Keeps full stops with abbreviations.
+
+    :param text: The text to tokenize.
+    :param doc: Annotated spaCy document containing the text, used to detect abbreviated names. If not given,
+        the text is processed by spaCy separately.
+    """
 
     # convert all apostrophes to '
     text = re.sub("[‹›’❮❯‚‘‛❛❜❟]", "'", text)
@@ -23,7 +45,8 @@ def word_tokenize(text: str) -> list[str]:
     tokens = words.findall(text)
 
     # fix abbreviated names (single upper-case letters + full stop)
-    doc = nlp(text)
+    if doc is None:
+        doc = ner_nlp(text)
     entities = ["PERSON", "NORP", "FAC", "FACILITY", "ORG", "EVENT", "LAW"]
     names = set([ent.text.strip() for ent in doc.ents if ent.label_ in entities])
     for index, token in enumerate(tokens):
@@ -36,6 +59,8 @@ def word_tokenize(text: str) -> list[str]:
 def sent_tokenize(text: str) -> list[str]:
     """Tokenizes text into sentences using nltk.sent_tokenize."""
 
+    import nltk
+
     # replace symbols that are problematic for nltk.tokenize
     text = re.sub("[“‟„”«»❝❞⹂〝〞〟＂]", "\"", re.sub("[‹›’❮❯‚‘‛❛❜❟]", "'", text))
     return nltk.sent_tokenize(text)
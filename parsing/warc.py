@@ -0,0 +1,156 @@
+import gzip
+import io
+import logging
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Union
+
+from parsing.webpage_parser import decode_html
+
+# content types of records evaluated as webpages
+HTML_CONTENT_TYPES = ["text/html", "application/xhtml+xml"]
+
+logger = logging.getLogger("alpaca")
+
+
+class WarcRecord(NamedTuple):
+    """A single record of a WARC (web archive) file.
+
+    :param type: The record's WARC-Type, e.g. "response", "request" or "metadata".
+    :param url: The record's WARC-Target-URI, empty if it has none.
+    :param headers: WARC headers of the record by lower-case name.
+    :param payload: The record's content block, for response records the HTTP response including its headers.
+    """
+    type: str
+    url: str
+    headers: dict[str, str]
+    payload: bytes
+
+
+def iter_warc_records(source: Union[str, Path, BinaryIO]) -> Iterator[WarcRecord]:
+    """Reads the records of a WARC file one after another, without loading the whole file.
+
+    Both uncompressed and gzip-compressed files (one gzip member per record, *.warc.gz) are supported. Lines that don't
+    start a valid record are skipped up to the next record.
+
+    :param source: Path of the WARC file, or a binary file object to read from.
+    """
+
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as warc_file:
+            yield from iter_warc_records(warc_file)
+        return
+
+    if not hasattr(source, "peek"):
+        source = io.BufferedReader(source)
+    if source.peek(2)[:2] == b"\x1f\x8b":
+        source = gzip.GzipFile(fileobj=source)
+
+    while True:
+        line = source.readline()
+        if not line:
+            return
+        if not line.strip():
+            # blank lines separating records
+            continue
+        if not line.startswith(b"WARC/"):
+            logger.debug("[WARC] Skipping invalid record start: {!r}".format(line[:50]))
+            continue
+
+        headers = {}
+        while (line := source.readline()).strip():
+            name, _, value = line.decode("utf-8", errors="replace").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            logger.debug("[WARC] Skipping record with invalid content length: " + headers["content-length"])
+            continue
+        payload = source.read(length)
+        yield WarcRecord(headers.get("warc-type", ""), headers.get("warc-target-uri", "").strip("<>"), headers, payload)
+
+
+def iter_html_pages(source: Union[str, Path, BinaryIO]) -> Iterator[tuple[str, str]]:
+    """Reads the html webpages archived in a WARC file one after another, with their original URL.
+
+    Uses successful (2xx) HTTP responses and resource records with an html content type. Chunked and compressed
+    (gzip, deflate) HTTP bodies are decoded, the charset is detected as for downloaded webpages (see decode_html).
+    Malformed records are skipped.
+
+    :param source: Path of the WARC file, or a binary file object to read from.
+    :return: Iterator over (URL, html).
+    """
+
+    for record in iter_warc_records(source):
+        try:
+            if record.type == "response" and record.headers.get("content-type", "").startswith("application/http"):
+                html = _http_response_html(record.payload)
+            elif record.type == "resource" and _is_html(record.headers.get("content-type", "")):
+                html = decode_html(record.payload, record.headers.get("content-type"))
+            else:
+                continue
+        except Exception as err:
+            logger.debug("[WARC] Skipping malformed record for {}: {!r}".format(record.url, err))
+            continue
+        if html:
+            yield record.url, html
+
+
+def _http_response_html(payload: bytes) -> Optional[str]:
+    """Returns the html body of an archived HTTP response, None if it is no successful html response."""
+
+    # some archives store HTTP headers with bare line feeds
+    head, _, body = payload.partition(b"\r\n\r\n" if b"\r\n\r\n" in payload else b"\n\n")
+    lines = head.decode("iso-8859-1").splitlines()
+    if not lines:
+        return None
+    status = lines[0].split(" ")
+    if len(status) < 2 or not status[1].startswith("2"):
+        return None
+
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if not _is_html(headers.get("content-type", "")):
+        return None
+
+    try:
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            body = _dechunk(body)
+        encoding = headers.get("content-encoding", "").lower()
+        if encoding in ["gzip", "x-gzip"]:
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            try:
+                body = zlib.decompress(body)
+            except zlib.error:
+                # raw deflate stream without zlib header
+                body = zlib.decompress(body, -zlib.MAX_WBITS)
+        elif encoding not in ["", "identity"]:
+            logger.debug("[WARC] Unsupported content encoding " + encoding)
+            return None
+    except (ValueError, zlib.error) as err:
+        logger.debug("[WARC] Could not decode response body: " + str(err))
+        return None
+
+    return decode_html(body, headers.get("content-type"))
+
+
+def _dechunk(body: bytes) -> bytes:
+    """Decodes an HTTP body in chunked transfer encoding."""
+
+    chunks = []
+    position = 0
+    while True:
+        line_end = body.index(b"\r\n", position)
+        size = int(body[position:line_end].split(b";")[0], 16)
+        if size == 0:
+            return b"".join(chunks)
+        chunks.append(body[line_end + 2:line_end + 2 + size])
+        position = line_end + 2 + size + 2
+
+
+def _is_html(content_type: str) -> bool:
+    return content_type.split(";")[0].strip().lower() in HTML_CONTENT_TYPES
@@ -1,4 +1,10 @@
-from parsing.tokenize import word_tokenize, sent_tokenize
+from typing import TYPE_CHECKING
+
+from parsing.tokenize import annotate, word_tokenize, sent_tokenize
+
+if TYPE_CHECKING:
+    from lxml.html import HtmlElement
+    from spacy.tokens import Doc
 
 
 class WebpageData:
@@ -11,6 +17,12 @@ class WebpageData:
     :param url: The webpage's URL.
     :param text_sentences: The article text's tokenized sentences.
     :param text_words: The article text's tokenized words.
+    :param headline_words: The article title's tokenized words.
+    :param doc: The spaCy document of headline and text (see parsing.tokenize.annotate), shared by all evaluators.
+    :param dom: The parsed html document tree (see parsing.webpage_parser.parse_html), shared by all evaluators.
+        None if not parsed (yet).
+
+    Intermediate results shared by several evaluators are held in **artifacts** (see scoring.artifacts).
     """
 
     def __init__(self,
@@ -20,11 +32,18 @@ class WebpageData:
                  authors: list[str] = [],
                  url: str = "",
                  text_sentences: list[str] = None,
-                 text_words: list[str] = None):
+                 text_words: list[str] = None,
+                 headline_words: list[str] = None,
+                 doc: "Doc" = None,
+                 dom: "HtmlElement" = None):
         self.html = html
         self.headline = headline
         self.text = text
         self.authors = authors
         self.url = url
+        self.dom = dom
+        self.artifacts = {}
+        self.doc = doc if doc is not None else annotate(headline, text)
         self.text_sentences = text_sentences or sent_tokenize(text)
-        self.text_words = text_words or word_tokenize(text)
+        self.text_words = text_words or word_tokenize(text, self.doc)
+        self.headline_words = headline_words or word_tokenize(headline, self.doc)
@@ -1,19 +1,52 @@
-import io
+import codecs
+import copy
 import json
 import logging
 import re
+from typing import Optional, TYPE_CHECKING
 from urllib.parse import urlparse
 
-import trafilatura
-from bs4 import BeautifulSoup
-from newspaper import Article, ArticleException
-
-from parsing.tokenize import sent_tokenize, word_tokenize
+import deadlines
+import timing
+from parsing import fetch_cache, page_cache
+from parsing.tokenize import annotate, sent_tokenize, word_tokenize
 from parsing.webpage_data import WebpageData
 
+if TYPE_CHECKING:
+    from lxml.html import HtmlElement
+    from newspaper import Article
+
+# increase whenever changes affect parsing results, invalidates the parsed page cache
+PARSER_VERSION = 1
+
 logger = logging.getLogger("alpaca")
 
 
+class _ForwardingHandler(logging.Handler):
+    """Forwards log messages of an external library to our own logger (debug level), line by line."""
+
+    def __init__(self, prefix: str):
+        super().__init__()
+        self.prefix = prefix
+
+    def emit(self, record: logging.LogRecord):
+        for message in self.format(record).strip().split("\n"):
+            if message:
+                logger.debug(self.prefix + " " + message)
+
+
+def _redirect_external_logging(logger_name: str, prefix: str):
+    """Redirects an external library's logger to our own logger. Safe for concurrent downloads and extraction."""
+
+    external_logger = logging.getLogger(logger_name)
+    external_logger.propagate = False
+    external_logger.addHandler(_ForwardingHandler(prefix))
+
+
+_redirect_external_logging("article", "[Parsing>Newspaper]")
+_redirect_external_logging("trafilatura", "[Parsing>Trafilatura]")
+
+
 def has_ending_punctuation(text: str) -> bool:
     """Checks whether the text ending (last two characters) contains any of . ! ? :"""
 
@@ -47,53 +80,149 @@ def get_real_url(url: str) -> str:
     return url
 
 
-def parse_data(url: str) -> WebpageData:
-    """Extracts data necessary for credibility evaluation given a webpage's URL.
+def parse_html(html: str) -> Optional["HtmlElement"]:
+    """Parses an html document into an lxml element tree. Returns None if the html could not be parsed.
 
-    Fetches HTML data, then parses article text, headline and author(s) from HTML.
-    Additionally tokenizes article text into words and sentences. Webpage is assumed to be in English.
+    Comments and processing instructions are dropped like in trafilatura's own html loader, so that text extraction
+    from the tree gives the same result as from the html string.
     """
 
-    # download & parse article html, redirecting external logging to our own logger
-    with io.StringIO() as buf:
-        np_logger = logging.getLogger("article")
-        propagate_state = np_logger.propagate
-        np_logger.propagate = False
-        buf_handler = logging.StreamHandler(buf)
-        np_logger.addHandler(buf_handler)
+    from lxml import etree, html as lxml_html
 
+    if not html:
+        return None
+    parser = lxml_html.HTMLParser(remove_comments=True, remove_pis=True)
+    try:
+        return lxml_html.document_fromstring(html, parser=parser)
+    except ValueError:
+        # lxml rejects unicode strings containing an xml encoding declaration
         try:
-            article = Article(url, language="en", fetch_images=False)
-            article.download()
-            article.parse()
-
-        except ArticleException as err:
-            logger.debug("[Parsing>Newspaper] " + str(err))
-        finally:
-            np_logger.removeHandler(buf_handler)
-            np_logger.propagate = propagate_state
-            for message in buf.getvalue().strip().split("\n"):
-                if message:
-                    logger.debug("[Parsing>Newspaper] " + message)
-
-    if not article or not article.html:
+            return lxml_html.document_fromstring(html.encode("utf-8"), parser=parser)
+        except (ValueError, etree.ParserError) as err:
+            logger.debug("[Parsing>lxml] " + str(err))
+    except etree.ParserError as err:
+        logger.debug("[Parsing>lxml] " + str(err))
+    return None
+
+
+def decode_html(content: bytes, content_type: str = None) -> str:
+    """Decodes html bytes (e.g. read from a file or archive) to a string.
+
+    The charset is taken from a byte order mark, the Content-Type header (if given) or a meta tag within the first
+    kilobytes of the document, in that order, and defaults to UTF-8. Undecodable bytes are replaced.
+    """
+
+    charset = None
+    for bom, bom_charset in [(codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"),
+                             (codecs.BOM_UTF16_BE, "utf-16")]:
+        if content.startswith(bom):
+            charset = bom_charset
+            break
+    if not charset and content_type and (match := re.search(r"charset=[\"']?([\w.:-]+)", content_type, re.I)):
+        charset = match.group(1)
+    if not charset and (match := re.search(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", content[:4096], re.I)):
+        charset = match.group(1).decode("ascii")
+
+    try:
+        codecs.lookup(charset or "utf-8")
+    except LookupError:
+        logger.debug("[Parsing] Unknown charset " + charset)
+        charset = None
+    return content.decode(charset or "utf-8", errors="replace")
+
+
+def fetch_html(url: str) -> str:
+    """Downloads a webpage's html. Returns an empty string if the download failed.
+
+    If the fetch cache is enabled (see parsing.fetch_cache), webpages are served from and stored in the cache. In
+    offline mode, webpages missing from the cache are not downloaded. In record mode, every fetched webpage is also
+    stored in the archive, in replay mode webpages are only served from the archive.
+    """
+
+    archive = fetch_cache.get_archive()
+    if archive and fetch_cache.replay_mode():
+        html = archive.get(url)
+        if html is None:
+            logger.error("[Parsing] Webpage not in archive (replay mode): " + url)
+            return ""
+        logger.debug("[Parsing] Webpage replayed from archive: " + url)
+        return html
+
+    html = _fetch_html(url)
+    if archive and html:
+        archive.put(url, html)
+    return html
+
+
+def _fetch_html(url: str) -> str:
+    """Downloads a webpage's html or serves it from the fetch cache. Returns an empty string if the download failed."""
+
+    cache = fetch_cache.get_fetch_cache()
+    if cache:
+        html = cache.get(url, allow_expired=fetch_cache.offline_mode())
+        if html is not None:
+            logger.debug("[Parsing] Webpage served from fetch cache: " + url)
+            return html
+        if fetch_cache.offline_mode():
+            logger.error("[Parsing] Webpage not in fetch cache (offline mode): " + url)
+            return ""
+
+    with timing.timed("fetch"):
+        html = _download_html(url)
+    if cache and html:
+        cache.put(url, html)
+    return html
+
+
+def _download_html(url: str) -> str:
+    """Downloads a webpage's html via newspaper. Returns an empty string if the download failed."""
+
+    from newspaper import Article
+
+    article = Article(url, language="en", fetch_images=False)
+    deadlines.run_with_deadline("download", article.download)
+    if article.download_exception_msg:
+        logger.debug("[Parsing>Newspaper] " + article.download_exception_msg)
+    return article.html
+
+
+def parse_data(url: str, html: str = None) -> WebpageData:
+    """Extracts data necessary for credibility evaluation given a webpage's URL.
+
+    Fetches HTML data (unless already given), then parses article text, headline and author(s) from HTML. The HTML
+    document tree is parsed once and shared by text extraction, author extraction and evaluators. Additionally
+    tokenizes article text into words and sentences. Webpage is assumed to be in English. Raises
+    deadlines.StageTimeout if download, extraction or annotation exceed their deadline.
+
+    :param url: The webpage's URL.
+    :param html: The webpage's html if it has already been downloaded, see fetch_html.
+    """
+
+    if html is None:
+        html = fetch_html(url)
+    if not html:
         logger.error("[Parsing] Could not parse webpage html")
         return WebpageData()
 
-    # parse article text
-    text = _parse_text(article)
+    cache = page_cache.get_page_cache()
+    if cache and (cached_data := cache.load(url, html)):
+        logger.debug("[Parsing] Parsed webpage served from page cache: " + url)
+        return cached_data
+
+    # a single deadline covers the whole extraction stage
+    with timing.timed("extraction"):
+        article, dom, text, authors = deadlines.run_with_deadline("extraction", _extract, url, html)
     if not text:
         logger.error("[Parsing] Could not parse webpage text")
         return WebpageData()
 
-    # parse article authors
-    authors = article.authors
-    if not authors:
-        authors = _extract_authors(article.html)
-
-    # tokenize text
-    sentences = sent_tokenize(text)
-    words = word_tokenize(text)
+    # annotate headline and text once for all evaluators, then tokenize text
+    with timing.timed("annotation"):
+        doc = deadlines.run_with_deadline("annotation", annotate, article.title, text)
+    with timing.timed("sentence_tokenization"):
+        sentences = sent_tokenize(text)
+    with timing.timed("word_tokenization"):
+        words = word_tokenize(text, doc)
     if not words or not sentences or len(words) <= 5:
         logger.error("[Parsing] Could not tokenize text")
         return WebpageData()
@@ -104,25 +233,53 @@ def parse_data(url: str) -> WebpageData:
     logger.info("[Parsing] Text: {}".format(text[:200] + " [...] " + text[-200:]).replace("\n", " "))
     # logger.debug("[Parsing] Full text: {}".format(text))
 
-    return WebpageData(article.html, article.title, text, authors, url, sentences, words)
+    with timing.timed("word_tokenization"):
+        headline_words = word_tokenize(article.title, doc)
+    page_data = WebpageData(html, article.title, text, authors, url, sentences, words, headline_words, doc, dom)
+    if cache:
+        cache.store(page_data)
+    return page_data
 
 
-def _parse_text(article: Article) -> str:
-    """Parse text from an article. Conducts some basic text cleanup."""
+def _extract(url: str, html: str) -> tuple["Article", Optional["HtmlElement"], str, list[str]]:
+    """Extracts article metadata, html tree, text and authors from a webpage's html."""
 
-    # parse text from html, redirecting external logging to our own logger
-    with io.StringIO() as buf:
-        traf_logger = logging.getLogger("trafilatura")
-        propagate_state = traf_logger.propagate
-        traf_logger.propagate = False
-        buf_handler = logging.StreamHandler(buf)
-        traf_logger.addHandler(buf_handler)
-        parsed_text = trafilatura.extract(article.html, include_comments=False, include_tables=False)
-        traf_logger.removeHandler(buf_handler)
-        traf_logger.propagate = propagate_state
-        for message in buf.getvalue().strip().split("\n"):
-            if message:
-                logger.debug("[Parsing>Trafilatura] " + message)
+    # parse article html
+    article = _parse_article(url, html)
+    dom = parse_html(html)
+
+    # parse article text
+    text = _parse_text(article, dom)
+
+    # parse article authors
+    authors = article.authors
+    if not authors and dom is not None:
+        authors = _extract_authors(dom)
+    return article, dom, text, authors
+
+
+def _parse_article(url: str, html: str) -> "Article":
+    """Parses headline, authors and (fallback) text of an article from its html via newspaper."""
+
+    from newspaper import Article, ArticleException
+
+    article = Article(url, language="en", fetch_images=False)
+    try:
+        article.download(input_html=html)
+        article.parse()
+    except ArticleException as err:
+        logger.debug("[Parsing>Newspaper] " + str(err))
+    return article
+
+
+def _parse_text(article: "Article", dom: Optional["HtmlElement"]) -> str:
+    """Parse text from an article, using its parsed html tree if available. Conducts some basic text cleanup."""
+
+    import trafilatura
+
+    # parse text from html, trafilatura prunes the tree it is given so it works on a copy of the shared document
+    parsed_text = trafilatura.extract(copy.deepcopy(dom) if dom is not None else article.html,
+                                      include_comments=False, include_tables=False)
 
     parsed_text = parsed_text or article.text
     if not parsed_text:
@@ -141,15 +298,14 @@ def _parse_text(article: Article) -> str:
     return text.strip()
 
 
-def _extract_authors(html: str) -> list[str]:
+def _extract_authors(dom: "HtmlElement") -> list[str]:
     """Extracts web article author(s) for specific html site structures."""
 
     authors = []
-    soup = BeautifulSoup(html, "html.parser")
 
-    for match in soup.findAll("script", type="application/ld+json"):
+    for match in dom.xpath("//script[@type='application/ld+json']"):
         try:
-            page_dict = json.loads("".join(match.contents))
+            page_dict = json.loads(match.text or "")
             if page_dict and type(page_dict) is dict:
 
                 # BBC.com (e.g. https://www.bbc.com/news/world-asia-57516630)
@@ -170,9 +326,9 @@ def _extract_authors(html: str) -> list[str]:
             logger.debug("[Parsing>json] " + str(err))
 
     # theguardian.com
-    for meta_author in soup.findAll("meta", property="article:author"):
-        if meta_author.has_attr("content"):
-            authors.append(meta_author["content"])
+    for meta_author in dom.xpath("//meta[@property='article:author']"):
+        if meta_author.get("content") is not None:
+            authors.append(meta_author.get("content"))
 
     if authors:
         logger.debug("[Parsing] {} additional author(s) detected: {}".format(len(authors), authors))
@@ -0,0 +1,223 @@
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Iterable, Iterator, Union
+
+import deadlines
+import stats_collector
+import timing
+from parsing import warc
+from parsing.webpage_parser import fetch_html
+from scoring.credibility_evaluation import evaluate_webpage
+
+# default number of concurrent downloads
+FETCH_WORKERS = 8
+# default number of scoring processes
+SCORE_WORKERS = os.cpu_count() or 1
+# default capacity of the queues between stages, fetchers block while the downloaded html queue is full
+QUEUE_SIZE = 32
+# seconds between checks for finished scoring jobs while new html is waiting
+_POLL_INTERVAL = 0.05
+
+logger = logging.getLogger("alpaca")
+
+# marks the end of a stage's output
+_DONE = object()
+
+
+def evaluate_urls(urls: Iterable[str],
+                  fetch_workers: int = FETCH_WORKERS,
+                  score_workers: int = SCORE_WORKERS,
+                  queue_size: int = QUEUE_SIZE) -> Iterator[tuple[str, float]]:
+    """Evaluates the credibility of many webpages with separate fetch and score stages.
+
+    Fetcher threads download html concurrently into a bounded queue, from which a pool of scoring processes evaluates
+    the webpages. Fetchers block while the queue is full and at most **score_workers** webpages are being scored at
+    once, so memory use stays bounded regardless of the number of URLs. Signal statistics and stage timings collected by
+    the scoring processes are added to the stats_collector and timing module of the calling process.
+
+    :param urls: URLs of the webpages to evaluate, consumed lazily.
+    :param fetch_workers: Number of concurrent downloads.
+    :param score_workers: Number of scoring processes.
+    :param queue_size: Capacity of the queues between stages.
+    :return: Iterator over (URL, credibility score) in order of completion, see evaluate_webpage for the score range
+        and error codes. Webpages whose evaluation raised an exception get -2.
+    """
+
+    # scoring processes are started before any pipeline thread, so they are not forked from a multi-threaded process
+    executor = _start_executor(score_workers)
+    url_queue = queue.Queue(maxsize=queue_size)
+    html_queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def feed():
+        try:
+            for url in urls:
+                if not _put(url_queue, url, stop):
+                    return
+        finally:
+            for _ in range(fetch_workers):
+                _put(url_queue, _DONE, stop)
+
+    def fetch():
+        while (url := _get(url_queue, stop)) is not _DONE:
+            try:
+                html = fetch_html(url)
+            except deadlines.StageTimeout as err:
+                logger.error("[Pipeline] Fetching {} timed out: {}".format(url, err))
+                html = None
+            except Exception as err:
+                logger.error("[Pipeline] Fetching {} failed: {}".format(url, err))
+                html = ""
+            if not _put(html_queue, (url, html), stop):
+                return
+        _put(html_queue, _DONE, stop)
+
+    threads = [threading.Thread(target=feed, daemon=True)]
+    threads += [threading.Thread(target=fetch, daemon=True) for _ in range(fetch_workers)]
+    for thread in threads:
+        thread.start()
+
+    active_fetchers = fetch_workers
+    # URLs of the webpages being scored, by future
+    pending = {}
+
+    try:
+        while active_fetchers or pending:
+            # hand downloaded html to free scoring processes, only wait for downloads if nothing is being scored
+            while active_fetchers and len(pending) < score_workers:
+                try:
+                    item = html_queue.get(block=not pending)
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    active_fetchers -= 1
+                elif item[1] is None:
+                    yield item[0], -3
+                elif not item[1]:
+                    logger.error("[Pipeline] Could not download " + item[0])
+                    yield item[0], -1
+                else:
+                    yield from _submit(executor, pending, *item)
+
+            if pending:
+                done, _ = wait(pending, timeout=_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                yield from _collect(done, pending)
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def evaluate_pages(pages: Iterable[tuple[str, str]],
+                   score_workers: int = SCORE_WORKERS) -> Iterator[tuple[str, float]]:
+    """Evaluates the credibility of many webpages whose html is already available, without downloading anything.
+
+    Webpages are consumed lazily and at most twice **score_workers** are held at once, so memory use stays bounded
+    regardless of the number of webpages. Signal statistics and stage timings are collected as in evaluate_urls.
+
+    :param pages: (URL, html) of the webpages to evaluate, e.g. read from a WARC file.
+    :param score_workers: Number of scoring processes.
+    :return: Iterator over (URL, credibility score) in order of completion, webpages whose evaluation raised an
+        exception get -2.
+    """
+
+    executor = _start_executor(score_workers)
+    # URLs of the webpages being scored, by future
+    pending = {}
+
+    try:
+        for url, html in pages:
+            if len(pending) >= 2 * score_workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from _collect(done, pending)
+            yield from _submit(executor, pending, url, html)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from _collect(done, pending)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def evaluate_warc(path: Union[str, Path], score_workers: int = SCORE_WORKERS) -> Iterator[tuple[str, float]]:
+    """Evaluates the credibility of all html webpages archived in a WARC file, read as a stream (see parsing.warc).
+
+    :param path: Path of the (optionally gzip-compressed) WARC file.
+    :param score_workers: Number of scoring processes.
+    :return: Iterator over (original URL, credibility score) in order of completion.
+    """
+
+    return evaluate_pages(warc.iter_html_pages(path), score_workers)
+
+
+def _start_executor(score_workers: int) -> ProcessPoolExecutor:
+    """Creates the pool of scoring processes and starts the processes right away."""
+
+    executor = ProcessPoolExecutor(max_workers=score_workers, initializer=stats_collector.set_stats_collection,
+                                   initargs=(stats_collector.stats_collection_enabled(),))
+    # the first submitted job starts the worker processes
+    executor.submit(int)
+    return executor
+
+
+def _submit(executor: ProcessPoolExecutor, pending: dict[Future, str], url: str,
+            html: str) -> Iterator[tuple[str, float]]:
+    """Schedules a webpage for scoring, yields its URL with score -2 if the scoring processes are no longer usable."""
+
+    try:
+        pending[executor.submit(_score, url, html)] = url
+    except BrokenProcessPool as err:
+        logger.error("[Pipeline] Evaluation of {} failed: {!r}".format(url, err))
+        yield url, -2
+
+
+def _collect(done: Iterable[Future], pending: dict[Future, str]) -> Iterator[tuple[str, float]]:
+    """Yields the results of finished scoring jobs and removes them from **pending**, adding their statistics and
+    timings to this process. Webpages whose evaluation raised an exception get score -2."""
+
+    for future in done:
+        url = pending.pop(future)
+        try:
+            url, score, url_stats, url_timings = future.result()
+        except Exception as err:
+            # e.g. an evaluator error, or a crashed scoring process
+            logger.error("[Pipeline] Evaluation of {} failed: {!r}".format(url, err))
+            yield url, -2
+            continue
+        stats_collector.add_results(url, url_stats)
+        timing.add_timings(url_timings)
+        yield url, score
+
+
+def _put(target: queue.Queue, item, stop: threading.Event) -> bool:
+    """Puts an item into a bounded queue, blocking while it is full. Returns False if the pipeline was stopped."""
+
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(source: queue.Queue, stop: threading.Event):
+    """Takes an item from a queue, blocking while it is empty. Returns the end marker if the pipeline was stopped."""
+
+    while not stop.is_set():
+        try:
+            return source.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            pass
+    return _DONE
+
+
+def _score(url: str, html: str) -> tuple[str, float, dict[str, float], dict[str, timing.LatencyHistogram]]:
+    """Scores downloaded html in a scoring process, returns the score and the statistics and timings collected."""
+
+    score = evaluate_webpage(url, html)
+    return url, score, stats_collector.pop_results(url), timing.pop_timings()
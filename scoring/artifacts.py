@@ -0,0 +1,86 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, NamedTuple
+
+from parsing.webpage_data import WebpageData
+from parsing.webpage_parser import parse_html
+
+# entity types used to recognise names, initialisms and acronyms
+NAME_ENTITY_LABELS = ["PERSON", "NORP", "FAC", "FACILITY", "ORG", "GPE", "LOC", "PRODUCT", "EVENT", "WORK_OF_ART",
+                      "LAW"]
+
+_lock = threading.Lock()
+
+
+class Artifact(NamedTuple):
+    """An intermediate result shared by several evaluators of a webpage, computed once per webpage.
+
+    :param compute: Computes the artifact given the webpage data.
+    :param requires: Names of other artifacts used by **compute**.
+    """
+    compute: Callable[[WebpageData], Any]
+    requires: tuple[str, ...] = ()
+
+
+# holds all artifacts evaluators can depend on, evaluator modules register their own via register_artifact()
+page_artifacts: dict[str, Artifact] = {}
+
+
+def register_artifact(name: str, compute: Callable[[WebpageData], Any], requires: tuple[str, ...] = ()):
+    """Registers an artifact that signals can declare as requirement and retrieve via get_artifact()."""
+
+    page_artifacts[name] = Artifact(compute, requires)
+
+
+def get_artifact(data: WebpageData, name: str) -> Any:
+    """Returns an artifact of the webpage, computing it on first request.
+
+    Thread-safe: every artifact is computed only once per webpage, concurrent requests wait for the first one.
+    """
+
+    with _lock:
+        future = data.artifacts.get(name)
+        owner = future is None
+        if owner:
+            future = data.artifacts[name] = Future()
+
+    if owner:
+        try:
+            future.set_result(page_artifacts[name].compute(data))
+        except BaseException as err:
+            future.set_exception(err)
+    return future.result()
+
+
+def resolve_requirements(names: list[str]) -> list[str]:
+    """Returns the given artifacts and everything they require, ordered such that requirements come first."""
+
+    ordered = []
+
+    def visit(name: str, path: tuple[str, ...]):
+        if name in path:
+            raise ValueError("Cyclic artifact requirements: " + " -> ".join(path + (name,)))
+        if name not in ordered:
+            for requirement in page_artifacts[name].requires:
+                visit(requirement, path + (name,))
+            ordered.append(name)
+
+    for artifact_name in names:
+        visit(artifact_name, ())
+    return ordered
+
+
+def _compute_dom(data: WebpageData):
+    """The webpage's parsed html document tree."""
+
+    return data.dom if data.dom is not None else parse_html(data.html)
+
+
+def _compute_entities(data: WebpageData) -> set[str]:
+    """Texts of all named entities in headline and text recognised as names, initialisms or acronyms."""
+
+    return set([ent.text.strip() for ent in data.doc.ents if ent.label_ in NAME_ENTITY_LABELS])
+
+
+register_artifact("dom", _compute_dom)
+register_artifact("entities", _compute_entities)
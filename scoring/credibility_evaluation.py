@@ -1,12 +1,22 @@
 import logging
-from typing import NamedTuple, Callable
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from pathlib import Path
+from typing import NamedTuple, Callable, Iterator, Optional, Union, TYPE_CHECKING
 
+import deadlines
 import parsing.webpage_parser as parser
 import scoring.evaluator_language_structure as ls
 import scoring.evaluator_tonality as tonality
 import stats_collector
+import timing
+from parsing import warc
 from parsing.webpage_data import WebpageData
-from parsing.webpage_parser import valid_address
+from parsing.webpage_parser import valid_address, decode_html
+from scoring import score_cache
+from scoring.artifacts import get_artifact, resolve_requirements
 from scoring.evaluator_author import evaluate_author
 from scoring.evaluator_clickbait import evaluate_clickbait
 from scoring.evaluator_errors import evaluate_errors
@@ -16,85 +26,256 @@ from scoring.evaluator_sentiment import evaluate_polarity_title, evaluate_polari
 from scoring.evaluator_url import evaluate_domain_ending
 from scoring.evaluator_vocabulary import evaluate_profanity, evaluate_emotional_words
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# number of threads evaluating the signals of a webpage concurrently, 1 evaluates them one after another
+SIGNAL_WORKERS = min(8, os.cpu_count() or 1)
+# skip evaluators of signals whose weight is zero for a webpage regardless of their sub-score (e.g. title signals for
+# webpages without headline), unless signal statistics are collected
+SKIP_ZERO_WEIGHT_SIGNALS = True
+# skip signals exceeding the signal deadline or a stage deadline within their evaluator (see deadlines.STAGE_DEADLINES),
+# otherwise the whole evaluation fails
+SKIP_TIMED_OUT_SIGNALS = True
+# largest share of the total signal weight that can be skipped this way before the evaluation fails (-3)
+MAX_SKIPPED_SIGNAL_WEIGHT = 0.5
+# smoothing factor of the moving average of measured signal evaluation times, see evaluate_webpage(threshold=...)
+SIGNAL_COST_SMOOTHING = 0.2
+
 logger = logging.getLogger("alpaca")
 
+# shared by all evaluations, created on first use
+_signal_executor = None
+_executor_lock = threading.Lock()
+# exponential moving average of each signal's evaluation time in seconds, measured in this process
+_signal_costs: dict[str, float] = {}
+
+# conditions on the webpage data that signal weights can depend on
+PAGE_CONDITIONS: dict[str, Callable[[WebpageData], bool]] = {
+    "headline":                 lambda data: bool(data.headline),
+    "url":                      lambda data: bool(data.url),
+    "valid_url":                lambda data: valid_address(data.url) and bool(data.html),  # includes available html
+    "headline_not_all_caps":    lambda data: data.headline.upper() != data.headline,
+}
+
+# conditions on a signal's own sub-score that its weight can depend on, work on single scores and NumPy arrays
+SCORE_CONDITIONS: dict[str, Callable] = {
+    "score_is_1":               lambda score: score == 1,
+    "score_below_1":            lambda score: score < 1,
+}
+
+
+class SignalWeight(NamedTuple):
+    """Declarative weight of a credibility signal: the base weight applies if all conditions hold, otherwise it is 0.
+
+    :param base: Weight used when combining all sub-scores into the overall webpage score.
+    :param conditions: Names of conditions from **PAGE_CONDITIONS** and **SCORE_CONDITIONS**.
+    """
+    base: float
+    conditions: tuple[str, ...] = ()
+
+    def __call__(self, score: float, data: WebpageData) -> float:
+        """Returns the weight for a single webpage given the signal's sub-score and the webpage data."""
+
+        for condition in self.conditions:
+            if condition in SCORE_CONDITIONS:
+                if not SCORE_CONDITIONS[condition](score):
+                    return 0
+            elif not PAGE_CONDITIONS[condition](data):
+                return 0
+        return self.base
+
+    def is_zero(self, data: WebpageData) -> bool:
+        """Returns True if the weight is 0 for a webpage whatever the sub-score, i.e. before evaluating the signal."""
+
+        return self.base == 0 or not all(PAGE_CONDITIONS[condition](data) for condition in self.conditions
+                                         if condition in PAGE_CONDITIONS)
+
 
 class CredibilitySignal(NamedTuple):
-    """A webpage credibility signal, including its evaluator and weight functions.
+    """A webpage credibility signal, including its evaluator and weight.
 
     :param evaluator: Returns the signal sub-score given some webpage data. Between 0 - 1
-    :param weight_func: Returns weight to be used for this signal when combining all sub-scores into the overall webpage
-        score, takes own sub-score and webpage data as input.
+    :param weight: Weight to be used for this signal when combining all sub-scores into the overall webpage score,
+        depending on own sub-score and webpage data.
+    :param version: Version of the evaluator, increase whenever it changes to invalidate cached sub-scores.
+    :param requires: Names of the page artifacts the evaluator uses (see scoring.artifacts), computed once per webpage
+        and shared with other signals.
+    :param cost: Rough evaluation time in seconds, orders the signals in threshold mode until measured times are known.
     """
     evaluator: Callable[[WebpageData], float]
-    weight_func: Callable[[float, WebpageData], float]
+    weight: SignalWeight
+    version: int = 1
+    requires: tuple[str, ...] = ()
+    cost: float = 0.001
 
 
-# holds credibility signals with signal evaluator and weight functions
+# holds credibility signals with signal evaluator and weight
 evaluation_signals = {
-    "author":                       CredibilitySignal(evaluate_author,
-                                                      lambda score, data: 0.1),
-    "url_domain_ending":            CredibilitySignal(evaluate_domain_ending,
-                                                      lambda score, data: 0.5 if data.url and score == 1 else 0),
-    "errors":                       CredibilitySignal(evaluate_errors,
-                                                      lambda score, data: 0.35),
-    "tonality_questions_text":      CredibilitySignal(tonality.evaluate_questions_text,
-                                                      lambda score, data: 0.1),
+    "author":                       CredibilitySignal(evaluate_author, SignalWeight(0.1)),
+    "url_domain_ending":            CredibilitySignal(evaluate_domain_ending, SignalWeight(0.5, ("url", "score_is_1"))),
+    "errors":                       CredibilitySignal(evaluate_errors, SignalWeight(0.35),
+                                                      requires=("language_tool_matches", "entities"), cost=1),
+    "tonality_questions_text":      CredibilitySignal(tonality.evaluate_questions_text, SignalWeight(0.1)),
     "tonality_questions_title":     CredibilitySignal(tonality.evaluate_questions_title,
-                                                      lambda score, data: 0.1 if data.headline else 0),
-    "tonality_exclamations_text":   CredibilitySignal(tonality.evaluate_exclamations_text,
-                                                      lambda score, data: 0.4),
+                                                      SignalWeight(0.1, ("headline",))),
+    "tonality_exclamations_text":   CredibilitySignal(tonality.evaluate_exclamations_text, SignalWeight(0.4)),
     "tonality_exclamations_title":  CredibilitySignal(tonality.evaluate_exclamations_title,
-                                                      lambda score, data: 0.25 if data.headline else 0),
-    "tonality_all_caps_text":       CredibilitySignal(tonality.evaluate_all_caps_text,
-                                                      lambda score, data: 0.1),
+                                                      SignalWeight(0.25, ("headline",))),
+    "tonality_all_caps_text":       CredibilitySignal(tonality.evaluate_all_caps_text, SignalWeight(0.1),
+                                                      requires=("entities",), cost=0.002),
     "tonality_all_caps_title":      CredibilitySignal(tonality.evaluate_all_caps_title,
-                                                      lambda s, d: 0.4 if d.headline.upper() != d.headline else 0),
-    "readability":                  CredibilitySignal(evaluate_readability,
-                                                      lambda score, data: 0.5),
-    "ls_word_count_text":           CredibilitySignal(ls.evaluate_word_count_text,
-                                                      lambda score, data: 0.3),
-    "ls_word_count_title":          CredibilitySignal(ls.evaluate_word_count_title,
-                                                      lambda score, data: 0.35 if data.headline else 0),
-    "ls_sentence_count":            CredibilitySignal(ls.evaluate_sentence_count,
-                                                      lambda score, data: 0.4),
-    "ls_type_token_ratio":          CredibilitySignal(ls.evaluate_ttr,
-                                                      lambda score, data: 0),
-    "ls_word_length_text":          CredibilitySignal(ls.evaluate_word_length_text,
-                                                      lambda score, data: 0.3),
-    "ls_word_length_title":         CredibilitySignal(ls.evaluate_word_length_title,
-                                                      lambda score, data: 0.2 if data.headline else 0),
-    "vocabulary_profanity":         CredibilitySignal(evaluate_profanity,
-                                                      lambda score, data: 0.1 if score < 1 else 0),
-    "vocabulary_emotional_words":   CredibilitySignal(evaluate_emotional_words,
-                                                      lambda score, data: 0.7),
-    "clickbait":                    CredibilitySignal(evaluate_clickbait,
-                                                      lambda score, data: 0.5 if data.headline else 0),
-    "links_external":               CredibilitySignal(evaluate_links_external,
-                                                      lambda s, d: 0.1 if valid_address(d.url) and d.html else 0),
-    "sentiment_polarity_text":      CredibilitySignal(evaluate_polarity_text,
-                                                      lambda score, data: 0.35),
-    "sentiment_polarity_title":     CredibilitySignal(evaluate_polarity_title,
-                                                      lambda score, data: 0.35 if data.headline else 0),
-    "sentiment_subjectivity":       CredibilitySignal(evaluate_subjectivity,
-                                                      lambda score, data: 0.25),
+                                                      SignalWeight(0.4, ("headline_not_all_caps",)),
+                                                      requires=("entities",), cost=0.002),
+    "readability":                  CredibilitySignal(evaluate_readability, SignalWeight(0.5), cost=0.005),
+    "ls_word_count_text":           CredibilitySignal(ls.evaluate_word_count_text, SignalWeight(0.3)),
+    "ls_word_count_title":          CredibilitySignal(ls.evaluate_word_count_title, SignalWeight(0.35, ("headline",))),
+    "ls_sentence_count":            CredibilitySignal(ls.evaluate_sentence_count, SignalWeight(0.4)),
+    "ls_type_token_ratio":          CredibilitySignal(ls.evaluate_ttr, SignalWeight(0)),
+    "ls_word_length_text":          CredibilitySignal(ls.evaluate_word_length_text, SignalWeight(0.3)),
+    "ls_word_length_title":         CredibilitySignal(ls.evaluate_word_length_title, SignalWeight(0.2, ("headline",))),
+    "vocabulary_profanity":         CredibilitySignal(evaluate_profanity, SignalWeight(0.1, ("score_below_1",)),
+                                                      cost=0.002),
+    "vocabulary_emotional_words":   CredibilitySignal(evaluate_emotional_words, SignalWeight(0.7), cost=0.005),
+    "clickbait":                    CredibilitySignal(evaluate_clickbait, SignalWeight(0.5, ("headline",)), cost=0.01),
+    "links_external":               CredibilitySignal(evaluate_links_external, SignalWeight(0.1, ("valid_url",)),
+                                                      requires=("dom",), cost=0.002),
+    "sentiment_polarity_text":      CredibilitySignal(evaluate_polarity_text, SignalWeight(0.35), cost=0.02),
+    "sentiment_polarity_title":     CredibilitySignal(evaluate_polarity_title, SignalWeight(0.35, ("headline",))),
+    "sentiment_subjectivity":       CredibilitySignal(evaluate_subjectivity, SignalWeight(0.25), cost=0.05),
 }
 
 
-def evaluate_webpage(url: str) -> float:
+def page_condition_flags(pages: list[WebpageData]) -> dict[str, "np.ndarray"]:
+    """Evaluates all page conditions for a batch of webpages, returns one boolean vector per condition."""
+
+    import numpy as np
+
+    return {condition: np.array([bool(check(data)) for data in pages], dtype=bool)
+            for condition, check in PAGE_CONDITIONS.items()}
+
+
+def condition_mask(subscores: "np.ndarray", page_flags: dict[str, "np.ndarray"]) -> "np.ndarray":
+    """Returns a boolean matrix marking where each signal's weight conditions hold.
+
+    :param subscores: Sub-scores with one row per webpage and one column per signal of **evaluation_signals**.
+    :param page_flags: Page conditions of the webpages, see page_condition_flags.
+    """
+
+    import numpy as np
+
+    mask = np.ones(subscores.shape, dtype=bool)
+    for column, signal in enumerate(evaluation_signals.values()):
+        for condition in signal.weight.conditions:
+            if condition in SCORE_CONDITIONS:
+                mask[:, column] &= SCORE_CONDITIONS[condition](subscores[:, column])
+            else:
+                mask[:, column] &= page_flags[condition]
+    return mask
+
+
+def combine_scores(subscores: "np.ndarray", page_flags: dict[str, "np.ndarray"],
+                   base_weights: "np.ndarray" = None) -> "np.ndarray":
+    """Combines the sub-scores of a batch of webpages into overall credibility scores in one matrix operation.
+
+    Results are identical to the per-webpage combination in evaluate_webpage, sums are accumulated in signal order.
+
+    :param subscores: Sub-scores with one row per webpage and one column per signal of **evaluation_signals**.
+    :param page_flags: Page conditions of the webpages, see page_condition_flags.
+    :param base_weights: Base weight per signal, defaults to the weights in **evaluation_signals**.
+    :return: Credibility score per webpage.
+    """
+
+    import numpy as np
+
+    if base_weights is None:
+        base_weights = np.array([signal.weight.base for signal in evaluation_signals.values()], dtype=np.float64)
+    weights = base_weights * condition_mask(subscores, page_flags)
+    # rescale weight linearly from 1x to 2x for score between [0.75, 0.25] to penalise low scores
+    weights = weights * (2 - np.clip((subscores - 0.25) * 2, 0, 1))
+
+    # cumulative sums add up signals in order, exactly like the per-webpage loop
+    final_scores = np.cumsum(subscores * weights, axis=1)[:, -1]
+    weight_sums = np.cumsum(weights, axis=1)[:, -1]
+    return final_scores / weight_sums
+
+
+def evaluate_webpage(url: str, html: str = None, threshold: float = None) -> float:
     """Scores a webpage's credibility by combining the credibility scores of different evaluators.
 
     Obtains the webpage data from parser, retrieves the signal sub-scores, validates the results and then computes an
-    overall webpage credibility score using the **evaluation_weights** dict.
+    overall webpage credibility score using the signal weights in **evaluation_signals**.
+
+    If a **threshold** is given, signals are evaluated one after another, cheapest first, only until it is certain on
+    which side of the threshold the score lies. The returned value is then a bound of the exact score on the same side
+    of the threshold, so comparing it with the threshold classifies the webpage. Evaluate without threshold for the
+    exact score.
 
     :param url: URL of the webpage to be evaluated.
+    :param html: The webpage's html if it has already been downloaded, otherwise it is fetched from the URL.
+    :param threshold: Credibility threshold if only the classification into scores >= / < threshold is needed.
     :return: A credibility score from 0 (very low credibility) to 1 (very high credibility).
-        Returns -1 if the webpage could not be parsed, and -2 if it could not be evaluated.
+        Returns -1 if the webpage could not be parsed, -2 if it could not be evaluated, and -3 if the evaluation
+        exceeded a deadline (see deadlines.py).
     """
 
     logger.info("[Evaluation] Evaluating " + url)
 
-    page_data = parser.parse_data(url)
+    try:
+        with deadlines.page_deadline(), timing.timed("evaluation"):
+            return _evaluate_webpage(url, html, threshold)
+    except deadlines.StageTimeout as err:
+        logger.error("[Evaluation] Evaluation of {} timed out: {}".format(url, err))
+        return -3
+
+
+def evaluate_html(html: str, url: str, threshold: float = None) -> float:
+    """Scores the credibility of a webpage given its html, without downloading anything.
+
+    :param html: The webpage's html.
+    :param url: The webpage's (original) URL, used by the URL and link signals.
+    :param threshold: See evaluate_webpage.
+    :return: See evaluate_webpage.
+    """
+
+    return evaluate_webpage(url, html or "", threshold)
+
+
+def evaluate_file(path: Union[str, Path], url: str = None, threshold: float = None) -> float:
+    """Scores the credibility of a webpage stored as local html file.
+
+    :param path: Path of the html file, its charset is detected as for archived webpages (see decode_html).
+    :param url: The webpage's original URL, defaults to the file's URI (URL-based signals then have no weight).
+    :param threshold: See evaluate_webpage.
+    :return: See evaluate_webpage.
+    """
+
+    path = Path(path)
+    return evaluate_html(decode_html(path.read_bytes()), url or path.resolve().as_uri(), threshold)
+
+
+def evaluate_warc(path: Union[str, Path], threshold: float = None) -> Iterator[tuple[str, float]]:
+    """Scores the credibility of all html webpages archived in a WARC file, one after another.
+
+    The file is read as a stream, see parsing.warc. For parallel evaluation, use pipeline.evaluate_warc.
+
+    :param path: Path of the (optionally gzip-compressed) WARC file.
+    :param threshold: See evaluate_webpage.
+    :return: Iterator over (original URL, credibility score), see evaluate_webpage for the score range and error codes.
+        Webpages whose evaluation raised an exception get -2, so that one webpage doesn't end the whole run.
+    """
+
+    for url, html in warc.iter_html_pages(path):
+        try:
+            score = evaluate_html(html, url, threshold)
+        except Exception as err:
+            logger.error("[Evaluation] Evaluation of {} failed: {!r}".format(url, err))
+            score = -2
+        yield url, score
+
+
+def _evaluate_webpage(url: str, html: Optional[str], threshold: Optional[float]) -> float:
+    page_data = parser.parse_data(url, html)
     # check for valid data
     if not page_data or not page_data.url or not page_data.html or len(page_data.text) < 50:
         logger.error("[Evaluation] Webpage parsing failed for " + url)
@@ -103,13 +284,37 @@ def evaluate_webpage(url: str) -> float:
     scores = {}
     weight_sum = 0
     final_score = 0
+    page_hash = score_cache.content_hash(page_data) if score_cache.get_score_cache() else None
+    signals = evaluation_signals
+    if SKIP_ZERO_WEIGHT_SIGNALS and not stats_collector.stats_collection_enabled():
+        # signals that can't affect the overall score
+        signals = {signal_name: signal for signal_name, signal in evaluation_signals.items()
+                   if not signal.weight.is_zero(page_data)}
+        logger.debug("[Evaluation] Skipping zero weight signals: {}".format(
+            [signal_name for signal_name in evaluation_signals if signal_name not in signals]))
+    bound = None
+    if threshold is None:
+        subscores = _evaluate_signals(signals, page_data, page_hash)
+    else:
+        subscores, bound = _evaluate_signals_until_decided(signals, page_data, page_hash, threshold)
 
-    # compute sub-scores and sum up overall score via linear combination
-    for signal_name, signal in evaluation_signals.items():
-        subscore = signal.evaluator(page_data)
-        weight = signal.weight_func(subscore, page_data)
-        # rescale weight linearly from 1x to 2x for score between [0.75, 0.25] to penalise low scores
-        weight *= 2 - min(max((subscore - 0.25) * 2, 0), 1)
+    if bound is None:
+        # all signals were evaluated unless they were skipped after exceeding their deadline
+        max_weights = {signal_name: 0 if signal.weight.is_zero(page_data) else signal.weight.base
+                       for signal_name, signal in signals.items()}
+        skipped_weight = sum(max_weights[signal_name] for signal_name in signals if signal_name not in subscores)
+        if skipped_weight > MAX_SKIPPED_SIGNAL_WEIGHT * sum(max_weights.values()):
+            logger.error("[Evaluation] Too many signals exceeded their deadline for {}, only evaluated {}".format(
+                url, list(subscores)))
+            return -3
+
+    # sum up overall score via linear combination, in signal order
+    for signal_name, signal in signals.items():
+        if signal_name not in subscores:
+            # not needed to decide the threshold classification, or skipped after exceeding its deadline
+            continue
+        subscore = subscores[signal_name]
+        weight = _signal_weight(signal, subscore, page_data)
 
         scores[signal_name] = subscore
         final_score += subscore * weight
@@ -117,14 +322,184 @@ def evaluate_webpage(url: str) -> float:
         stats_collector.add_result(url, "score_" + signal_name, subscore)
 
     # check for valid scores
-    if not scores or len(scores) != len(evaluation_signals) or not all(0 <= score <= 1 for score in scores.values()):
+    if not scores or not all(0 <= score <= 1 for score in scores.values()):
         logger.error("[Evaluation] Error computing sub-scores: {}".format(scores))
         return -2
 
     logger.info("[Evaluation] Individual sub-scores: {}".format(
         [signal_name + " {:.3f}".format(score) for signal_name, score in scores.items()]))
 
+    if bound is not None:
+        logger.info("[Evaluation] Webpage score {} {} after {} of {} signals, bound {:.5f} for {}".format(
+            ">=" if bound >= threshold else "<", threshold, len(scores), len(signals), bound, url))
+        return bound
+
     final_score = final_score / weight_sum
     logger.info("[Evaluation] Overall webpage score: {:.5f} for {}".format(final_score, url))
     stats_collector.add_result(url, "credibility_score", final_score)
     return final_score
+
+
+def _signal_weight(signal: CredibilitySignal, subscore: float, page_data: WebpageData) -> float:
+    """Returns the weight of a signal's sub-score in the overall webpage score."""
+
+    weight = signal.weight(subscore, page_data)
+    # rescale weight linearly from 1x to 2x for score between [0.75, 0.25] to penalise low scores
+    return weight * (2 - min(max((subscore - 0.25) * 2, 0), 1))
+
+
+def _evaluate_signals_until_decided(signals: dict[str, CredibilitySignal], page_data: WebpageData, page_hash: str,
+                                    threshold: float) -> tuple[dict[str, float], Optional[float]]:
+    """Computes sub-scores cheapest signal first until the overall score's side of **threshold** is certain.
+
+    Signal costs are the moving averages of measured evaluation times, signals not measured yet in this process are
+    ordered by their estimated cost (see CredibilitySignal).
+
+    :return: The computed sub-scores, and the score bound deciding the classification if not all signals were needed
+        (the lower bound if the score is at least **threshold**, otherwise the upper bound).
+    """
+
+    # largest possible weight of each signal, doubled by rescaling for low sub-scores
+    max_weights = {signal_name: 0 if signal.weight.is_zero(page_data) else 2 * signal.weight.base
+                   for signal_name, signal in signals.items()}
+    remaining = sorted(signals, key=lambda name: _signal_costs.get(name, signals[name].cost))
+
+    subscores = {}
+    weighted_sum = 0
+    weight_sum = 0
+    while remaining:
+        signal_name = remaining.pop(0)
+        signal = signals[signal_name]
+        subscore = _evaluate_signal_within_deadline(signal_name, signal, page_data, page_hash)
+        if subscore is None:
+            continue
+        subscores[signal_name] = subscore
+        if not remaining or not 0 <= subscore <= 1:
+            break
+        weight = _signal_weight(signal, subscore, page_data)
+        weighted_sum += subscore * weight
+        weight_sum += weight
+
+        # remaining sub-scores are between 0 and 1, the score is lowest if they are 0 and highest if they are 1
+        remaining_weight = sum(max_weights[name] for name in remaining)
+        if weight_sum + remaining_weight > 0:
+            lower = weighted_sum / (weight_sum + remaining_weight)
+            upper = (weighted_sum + remaining_weight) / (weight_sum + remaining_weight)
+            if lower >= threshold:
+                return subscores, lower
+            if upper < threshold:
+                return subscores, upper
+    return subscores, None
+
+
+def _evaluate_signals(signals: dict[str, CredibilitySignal], page_data: WebpageData,
+                      page_hash: str = None) -> dict[str, float]:
+    """Computes the sub-scores of the given signals, concurrently with **SIGNAL_WORKERS** threads.
+
+    Page artifacts required by the signals are scheduled first, so each is computed once while independent signals
+    already run. Statistics are added in signal order, as if the signals had been evaluated one after another.
+    Signals skipped after exceeding their deadline have no sub-score.
+    """
+
+    subscores = {}
+    if SIGNAL_WORKERS <= 1:
+        for signal_name, signal in signals.items():
+            subscore = _evaluate_signal_within_deadline(signal_name, signal, page_data, page_hash)
+            if subscore is not None:
+                subscores[signal_name] = subscore
+        return subscores
+
+    executor = _get_signal_executor()
+    artifact_names = resolve_requirements([name for signal in signals.values() for name in signal.requires])
+    for artifact_name in artifact_names:
+        # signals requesting an artifact before it is scheduled compute it themselves, so this can't deadlock
+        executor.submit(get_artifact, page_data, artifact_name)
+    futures = {signal_name: executor.submit(deadlines.run_with_deadline, "signal", _evaluate_signal_detached,
+                                            signal_name, signal, page_data, page_hash)
+               for signal_name, signal in signals.items()}
+
+    try:
+        for signal_name, future in futures.items():
+            try:
+                # worker threads don't know the page deadline, so it is enforced while waiting for them
+                subscore, signal_stats = future.result(timeout=deadlines.time_left())
+            except TimeoutError:
+                if future.done():
+                    raise
+                deadlines.check_page_deadline()
+                raise
+            except deadlines.StageTimeout as err:
+                _skip_timed_out_signal(signal_name, err)
+                continue
+            subscores[signal_name] = subscore
+            stats_collector.add_results(page_data.url, signal_stats)
+    finally:
+        for future in futures.values():
+            future.cancel()
+    return subscores
+
+
+def _evaluate_signal_within_deadline(signal_name: str, signal: CredibilitySignal, page_data: WebpageData,
+                                     page_hash: str = None) -> Optional[float]:
+    """Computes a signal's sub-score within the signal deadline, returns None if it exceeded it and is skipped."""
+
+    try:
+        subscore, signal_stats = deadlines.run_with_deadline("signal", _evaluate_signal_detached,
+                                                             signal_name, signal, page_data, page_hash)
+    except deadlines.StageTimeout as err:
+        _skip_timed_out_signal(signal_name, err)
+        return None
+    stats_collector.add_results(page_data.url, signal_stats)
+    return subscore
+
+
+def _skip_timed_out_signal(signal_name: str, err: deadlines.StageTimeout):
+    """Skips a signal that exceeded its deadline if **SKIP_TIMED_OUT_SIGNALS**, otherwise fails the evaluation.
+
+    Deadlines of stages within the signal's evaluator (e.g. "language_tool") count as the signal's own, only the page
+    deadline always fails the evaluation.
+    """
+
+    if err.stage == "page" or not SKIP_TIMED_OUT_SIGNALS:
+        raise err
+    logger.warning("[Evaluation] Skipping signal {}: {}".format(signal_name, err))
+
+
+def _evaluate_signal_detached(signal_name: str, signal: CredibilitySignal, page_data: WebpageData,
+                              page_hash: str = None) -> tuple[float, dict[str, float]]:
+    """Computes a signal's sub-score, returning it together with the statistics it added (e.g. in a worker thread)."""
+
+    with stats_collector.capture_results(detached=True) as signal_stats:
+        subscore = _evaluate_signal(signal_name, signal, page_data, page_hash)
+    return subscore, signal_stats
+
+
+def _get_signal_executor() -> ThreadPoolExecutor:
+    global _signal_executor
+    with _executor_lock:
+        if _signal_executor is None:
+            _signal_executor = ThreadPoolExecutor(max_workers=SIGNAL_WORKERS, thread_name_prefix="signal")
+        return _signal_executor
+
+
+def _evaluate_signal(signal_name: str, signal: CredibilitySignal, page_data: WebpageData,
+                     page_hash: str = None) -> float:
+    """Computes a signal's sub-score, or retrieves it and its statistics from the sub-score cache if enabled."""
+
+    start = time.perf_counter()
+    cache = score_cache.get_score_cache()
+    if not cache:
+        subscore = signal.evaluator(page_data)
+    elif cached := cache.lookup(page_hash, signal_name, signal.version):
+        subscore, signal_stats = cached
+        stats_collector.add_results(page_data.url, signal_stats)
+    else:
+        with stats_collector.capture_results() as signal_stats:
+            subscore = signal.evaluator(page_data)
+        cache.store(page_hash, signal_name, signal.version, subscore, signal_stats)
+
+    cost = time.perf_counter() - start
+    timing.add_timing("signal_" + signal_name, cost)
+    previous_cost = _signal_costs.get(signal_name, cost)
+    _signal_costs[signal_name] = previous_cost + SIGNAL_COST_SMOOTHING * (cost - previous_cost)
+    return subscore
@@ -6,14 +6,30 @@ import string
 from contextlib import redirect_stderr
 from pathlib import Path
 
-from scipy import sparse
-
+import model_registry
 import stats_collector
 from parsing.webpage_data import WebpageData
 
 logger = logging.getLogger("alpaca")
 
 
+def _load_classifier():
+    """Loads the pickled clickbait model and tfidf vectorizer, redirecting external error prints to logger."""
+
+    with redirect_stderr(io.StringIO()) as buf:
+        with open((Path(__file__).parent / "files/nbmodel.pkl").resolve(), "rb") as model_file:
+            model = pickle.load(model_file)
+        with open((Path(__file__).parent / "files/tfidf.pkl").resolve(), "rb") as vectorizer_file:
+            vectorizer = pickle.load(vectorizer_file)
+        for message in buf.getvalue().strip().split("\n"):
+            if message:
+                logger.debug("[Clickbait>External] " + str(message))
+    return model, vectorizer
+
+
+model_registry.register("clickbait_classifier", _load_classifier)
+
+
 def evaluate_clickbait(data: WebpageData) -> float:
     """Determines whether a webpage's headline is clickbait.
 
@@ -31,28 +47,37 @@ def _is_clickbait(headline: str) -> bool:
     :return: True if submitted headline is clickbait, False otherwise.
     """
 
-    # load pickled model and tfidf vectorizer, redirect external error prints to logger
-    with redirect_stderr(io.StringIO()) as buf:
-        model = pickle.load(open((Path(__file__).parent / "files/nbmodel.pkl").resolve(), "rb"))
-        vectorizer = pickle.load(open((Path(__file__).parent / "files/tfidf.pkl").resolve(), "rb"))
-        for message in buf.getvalue().strip().split("\n"):
-            if message:
-                logger.debug("[Clickbait>External] " + str(message))
+    return classify_headlines([headline])[0]
+
+
+def classify_headlines(headlines: list[str]) -> list[bool]:
+    """Classifies a batch of headlines with a single vectorizer transform and model prediction.
+
+    :param headlines: Non-empty headlines to classify.
+    :return: For each headline, True if it is clickbait, False otherwise.
+    """
+
+    if not headlines:
+        return []
+
+    from scipy import sparse
 
-    cleaned_headline = _clean_text(headline)
-    headline_words = len(cleaned_headline.split())
-    question = _contains_question(cleaned_headline)
-    exclamation = _contains_exclamation(cleaned_headline)
-    starts_with_num = _starts_with_number(cleaned_headline)
+    model, vectorizer = model_registry.get("clickbait_classifier")
 
-    logger.debug("[Clickbait] Cleaned headline: " + cleaned_headline)
+    cleaned_headlines = [_clean_text(headline) for headline in headlines]
+    for cleaned_headline in cleaned_headlines:
+        logger.debug("[Clickbait] Cleaned headline: " + cleaned_headline)
 
-    vectorizer_input = [cleaned_headline]
-    vectorized = vectorizer.transform(vectorizer_input)
-    final = sparse.hstack([question, exclamation, starts_with_num, headline_words, vectorized])
+    # one row per headline: question, exclamation, starts with number, word count, tfidf vector
+    features = sparse.csr_matrix([[_contains_question(cleaned_headline),
+                                   _contains_exclamation(cleaned_headline),
+                                   _starts_with_number(cleaned_headline),
+                                   len(cleaned_headline.split())] for cleaned_headline in cleaned_headlines])
+    vectorized = vectorizer.transform(cleaned_headlines)
+    final = sparse.hstack([features, vectorized])
     result = model.predict(final)
 
-    return result == 1
+    return [prediction == 1 for prediction in result]
 
 
 def _clean_text(text: str) -> str:
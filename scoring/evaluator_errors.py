@@ -1,11 +1,10 @@
 import logging
 
-import language_tool_python as ltp
-import spacy
-
+import deadlines
+import model_registry
 import stats_collector
-from parsing.tokenize import word_tokenize
 from parsing.webpage_data import WebpageData
+from scoring.artifacts import get_artifact, register_artifact
 
 # upper limit for subscore
 ERROR_LIMIT = 0.02
@@ -16,8 +15,30 @@ if not 0 < ERROR_LIMIT <= 1:
 
 logger = logging.getLogger("alpaca")
 
-lang_tool = ltp.LanguageTool("en-US")
-nlp = spacy.load("en_core_web_sm")
+
+def _load_language_tool():
+    """Starts the local LanguageTool server for American English."""
+
+    import language_tool_python as ltp
+    return ltp.LanguageTool("en-US")
+
+
+model_registry.register("language_tool", _load_language_tool)
+
+
+def _check_language(data: WebpageData) -> list:
+    """Checks headline and text for spelling and grammar errors with LanguageTool, returns all rule matches."""
+
+    lang_tool = model_registry.get("language_tool")
+    matches = deadlines.run_with_deadline("language_tool", lang_tool.check, data.headline) if data.headline else []
+    if matches and matches[-1].ruleId == "PUNCTUATION_PARAGRAPH_END":
+        # ignore error for missing punctuation at title ending
+        matches.pop()
+    matches += deadlines.run_with_deadline("language_tool", lang_tool.check, data.text)
+    return matches
+
+
+register_artifact("language_tool_matches", _check_language)
 
 
 def evaluate_errors(data: WebpageData) -> float:
@@ -30,16 +51,10 @@ def evaluate_errors(data: WebpageData) -> float:
     :return: Value between 0 (large amount of errors) and 1 (no errors).
     """
 
-    matches = lang_tool.check(data.headline)
-    if matches and matches[-1].ruleId == "PUNCTUATION_PARAGRAPH_END":
-        # ignore error for missing punctuation at title ending
-        matches.pop()
-    matches += lang_tool.check(data.text)
+    matches = get_artifact(data, "language_tool_matches")
 
     # named entity recognition to avoid classifying names as spelling errors
-    doc = nlp(data.headline + "\n" + data.text)
-    entities = ["PERSON", "NORP", "FAC", "FACILITY", "ORG", "GPE", "LOC", "PRODUCT", "EVENT", "WORK_OF_ART", "LAW"]
-    names = set([ent.text.strip() for ent in doc.ents if ent.label_ in entities])
+    names = get_artifact(data, "entities")
     logger.debug("[Errors] {} recognised named entities: {}".format(len(names), names))
 
     # filter out irrelevant matches and penalise errors only once
@@ -57,7 +72,7 @@ def evaluate_errors(data: WebpageData) -> float:
             logger.debug("[Errors] Text error:\n{}".format(match))
 
     error_score = len(matches) - matches_to_ignore
-    word_count = len(word_tokenize(data.headline)) + len(data.text_words)
+    word_count = len(data.headline_words) + len(data.text_words)
     subscore = 1 - (error_score / (word_count * ERROR_LIMIT))
 
     logger.debug("[Errors] {} grammar or spelling errors in {} words ({} errors ignored), {:.3f} errors per word"
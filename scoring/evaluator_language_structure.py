@@ -1,6 +1,5 @@
 import logging
 
-from parsing.tokenize import word_tokenize
 from parsing.webpage_data import WebpageData
 import stats_collector
 
@@ -52,7 +51,7 @@ def evaluate_word_count_title(data: WebpageData) -> float:
         stats_collector.add_result(data.url, "word_count_title", -10)
         return 0
 
-    word_count = len(word_tokenize(data.headline))
+    word_count = len(data.headline_words)
 
     logger.debug("[Lang_structure] Words in title: " + str(word_count))
     stats_collector.add_result(data.url, "word_count_title", word_count)
@@ -129,7 +128,7 @@ def evaluate_word_length_title(data: WebpageData) -> float:
         stats_collector.add_result(data.url, "word_length_title", -10)
         return 0
 
-    headline_tokens = word_tokenize(data.headline)
+    headline_tokens = data.headline_words
     word_length = sum(len(word) for word in headline_tokens) / len(headline_tokens)
 
     logger.debug("[Lang_structure] Word length title: " + str(word_length))
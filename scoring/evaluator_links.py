@@ -1,11 +1,10 @@
 import logging
 from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
-
 import stats_collector
 from parsing.webpage_data import WebpageData
 from parsing.webpage_parser import valid_address, get_real_url
+from scoring.artifacts import get_artifact
 
 # upper limit for subscore
 LINKS_LIMIT = 3
@@ -35,21 +34,24 @@ def evaluate_links_external(data: WebpageData) -> float:
     if local_domain.startswith("www."):
         local_domain = local_domain[4:]
 
-    soup = BeautifulSoup(data.html, "html.parser")
+    # use the page's shared html document tree
+    dom = get_artifact(data, "dom")
+    anchors = dom.iter("a") if dom is not None else []
     links = {}
 
-    for link in soup.findAll('a'):
+    for link in anchors:
         link_url = get_real_url(link.get("href"))
+        link_text = link.text_content()
 
-        if link.text and link_url not in links and valid_address(link_url):
+        if link_text and link_url not in links and valid_address(link_url):
             link_domain = urlparse(link_url).hostname
             if link_domain.startswith("www."):
                 link_domain = link_domain[4:]
 
             # check whether url is external and link text appears in article text
             if (not local_domain == link_domain and not local_domain.endswith("." + link_domain)
-                    and not link_domain.endswith("." + local_domain) and link.text in data.text):
-                links[link_url] = link.text
+                    and not link_domain.endswith("." + local_domain) and link_text in data.text):
+                links[link_url] = link_text
 
     logger.debug("[Links] {} external links: {}".format(len(links), links))
     stats_collector.add_result(data.url, "links_count", len(links))
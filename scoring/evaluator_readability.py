@@ -1,6 +1,5 @@
 import logging
 
-import _readability as readability
 import stats_collector as stats
 from parsing.webpage_data import WebpageData
 
@@ -20,6 +19,8 @@ def evaluate_readability(data: WebpageData) -> float:
         and 1 indicating hard understandability (high text complexity).
     """
 
+    import _readability as readability
+
     read_metrics = readability.getmeasures(data.text_sentences, lang="en")
     coleman_liau = read_metrics["readability grades"]["Coleman-Liau"]
 
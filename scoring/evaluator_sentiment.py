@@ -1,9 +1,6 @@
 import logging
 
-import spacy
-from spacytextblob.spacytextblob import SpacyTextBlob
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-
+import model_registry
 import stats_collector
 from parsing.webpage_data import WebpageData
 
@@ -20,8 +17,42 @@ if not (-1 <= POLARITY_LIMITS_TEXT[0] < POLARITY_LIMITS_TEXT[1] <= 1
 
 logger = logging.getLogger("alpaca")
 
-nlp = spacy.load('en_core_web_sm')
-nlp.add_pipe("spacytextblob")
+
+def _load_vader():
+    """Creates the VADER sentiment analyzer, which reads its lexicon and emoji files on construction."""
+
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+
+model_registry.register("vader", _load_vader)
+
+
+def polarity_scores(texts: list[str]) -> list[dict[str, float]]:
+    """Computes VADER polarity scores for a batch of texts with the shared analyzer. Identical texts are scored once.
+
+    :return: For each text, a dict with negative, neutral, positive and compound sentiment.
+    """
+
+    analyzer = model_registry.get("vader")
+    unique_scores = {}
+    for text in texts:
+        if text not in unique_scores:
+            unique_scores[text] = analyzer.polarity_scores(text)
+    return [unique_scores[text] for text in texts]
+
+
+def evaluate_polarity_batch(pages: list[WebpageData]) -> list[tuple[float, float]]:
+    """Evaluates text and headline polarity for many webpages at once, see evaluate_polarity_text/_title.
+
+    :return: For each webpage, its text polarity score and headline polarity score.
+    """
+
+    text_polarities = polarity_scores([data.text for data in pages])
+    title_polarities = iter(polarity_scores([data.headline for data in pages if data.headline]))
+    return [(_score_polarity_text(data, text_polarity),
+             _score_polarity_title(data, next(title_polarities) if data.headline else None))
+            for data, text_polarity in zip(pages, text_polarities)]
 
 
 def evaluate_polarity_text(data: WebpageData) -> float:
@@ -36,7 +67,11 @@ def evaluate_polarity_text(data: WebpageData) -> float:
     :return: Value between 0 (relatively negative sentiment) and 1 (relatively positive sentiment).
     """
 
-    polarity_vader = SentimentIntensityAnalyzer().polarity_scores(data.text)
+    return _score_polarity_text(data, polarity_scores([data.text])[0])
+
+
+def _score_polarity_text(data: WebpageData, polarity_vader: dict[str, float]) -> float:
+    """Computes the text polarity score from the text's VADER polarity scores."""
 
     logger.debug("[Sentiment] Text polarity (VADER): {}".format(polarity_vader))
     stats_collector.add_result(data.url, "sentiment_text_vader", polarity_vader["compound"])
@@ -60,14 +95,18 @@ def evaluate_polarity_title(data: WebpageData) -> float:
     :return: Value between 0 (low negative sentiment) and 1 (high negative sentiment).
     """
 
+    return _score_polarity_title(data, polarity_scores([data.headline])[0] if data.headline else None)
+
+
+def _score_polarity_title(data: WebpageData, polarity_vader: dict[str, float]) -> float:
+    """Computes the headline polarity score from the headline's VADER polarity scores (None if headline is empty)."""
+
     if not data.headline:
         stats_collector.add_result(data.url, "sentiment_title_vader", -10)
         stats_collector.add_result(data.url, "positivity_title_vader", -10)
         stats_collector.add_result(data.url, "negativity_title_vader", -10)
         return 0
 
-    polarity_vader = SentimentIntensityAnalyzer().polarity_scores(data.headline)
-
     logger.debug("[Sentiment] Headline polarity (VADER): {}".format(polarity_vader))
     stats_collector.add_result(data.url, "sentiment_title_vader", polarity_vader["compound"])
     stats_collector.add_result(data.url, "positivity_title_vader", polarity_vader["pos"])
@@ -81,14 +120,16 @@ def evaluate_polarity_title(data: WebpageData) -> float:
 def evaluate_subjectivity(data: WebpageData) -> float:
     """Evaluates the subjectivity of the webpage.
 
-    Uses TextBlob (through spaCy) to compute the text's subjectivity. Score is linear between **SUBJECTIVITY_LIMITS[0]**
-     subjectivity or lower (best score => 1) and **SUBJECTIVITY_LIMITS[1]** subjectivity or higher (worst score => 0).
+    Uses TextBlob (through the page's shared spaCy document) to compute the text's subjectivity. Score is linear
+    between **SUBJECTIVITY_LIMITS[0]** subjectivity or lower (best score => 1) and **SUBJECTIVITY_LIMITS[1]**
+    subjectivity or higher (worst score => 0).
 
     :return: Value between 0 (high webpage subjectivity) and 1 (low webpage subjectivity).
     """
 
-    doc = nlp(data.text)
-    subjectivity = doc._.subjectivity
+    # shared document covers headline and text, only rate the text part
+    text_span = data.doc.char_span(len(data.headline) + 1, len(data.doc.text), alignment_mode="expand")
+    subjectivity = text_span._.subjectivity if text_span is not None else 0
 
     logger.debug("[Sentiment] Article subjectivity: {:.3f}".format(subjectivity))
     stats_collector.add_result(data.url, "subjectivity", subjectivity)
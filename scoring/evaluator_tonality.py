@@ -1,10 +1,9 @@
 import logging
 import re
 
-import spacy
-
 import stats_collector
 from parsing.webpage_data import WebpageData
+from scoring.artifacts import get_artifact
 
 # value limits for subscore computation
 QUESTIONS_LIMITS_TEXT = [0.05, 0.2]
@@ -20,8 +19,6 @@ if not (0 <= QUESTIONS_LIMITS_TEXT[0] < QUESTIONS_LIMITS_TEXT[1] <= 1
 
 logger = logging.getLogger("alpaca")
 
-nlp = spacy.load("en_core_web_sm")
-
 
 def evaluate_questions_text(data: WebpageData) -> float:
     """Evaluates webpage text question mark usage.
@@ -96,9 +93,7 @@ def evaluate_all_caps_text(data: WebpageData) -> float:
     all_caps = re.compile(r"\b[A-Z]+\b")
 
     # named entity recognition to avoid classifying initialisms/acronyms as all caps words
-    doc = nlp(data.headline + "\n" + data.text)
-    entity_labels = ["PERSON", "NORP", "FAC", "FACILITY", "ORG", "GPE", "LOC", "PRODUCT", "EVENT", "WORK_OF_ART", "LAW"]
-    entities = set([ent.text.strip() for ent in doc.ents if ent.label_ in entity_labels])
+    entities = get_artifact(data, "entities")
 
     # collect all-cap words in headline (unless empty/entirely capitalised)
     if data.headline.upper() != data.headline:
@@ -156,9 +151,7 @@ def evaluate_all_caps_title(data: WebpageData) -> float:
     all_caps = re.compile(r"\b[A-Z]+\b")
 
     # named entity recognition to avoid classifying initialisms/acronyms as all caps words
-    doc = nlp(data.headline + "\n" + data.text)
-    entity_labels = ["PERSON", "NORP", "FAC", "FACILITY", "ORG", "GPE", "LOC", "PRODUCT", "EVENT", "WORK_OF_ART", "LAW"]
-    entities = set([ent.text.strip() for ent in doc.ents if ent.label_ in entity_labels])
+    entities = get_artifact(data, "entities")
 
     # collect all-cap words in headline
     for word in all_caps.findall(data.headline):
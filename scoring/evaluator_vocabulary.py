@@ -1,14 +1,17 @@
+import csv
 import logging
 import re
 from collections import defaultdict
 from pathlib import Path
+from typing import NamedTuple, TYPE_CHECKING
 
-import pandas as pd
-
+import model_registry
 import stats_collector
-from parsing.tokenize import word_tokenize
 from parsing.webpage_data import WebpageData
 
+if TYPE_CHECKING:
+    import numpy as np
+
 # value limits for subscore computation
 PROFANITY_LIMIT = 0.0000000001
 EMOTION_LIMITS = [0.07, 0.125]
@@ -20,6 +23,96 @@ if PROFANITY_LIMIT <= 0 or not 0 <= EMOTION_LIMITS[0] < EMOTION_LIMITS[1] <= 1:
 logger = logging.getLogger("alpaca")
 
 
+class ProfanityMatcher:
+    """Counts occurrences of all profanity lexicon patterns in a single scan of the text.
+
+    Every lexicon entry is a regular expression matched on word boundaries. A combined lookahead pattern finds all
+    positions at which any entry matches, only those positions are then checked against the individual entries.
+    Counts are identical to running re.findall separately for every entry.
+
+    :param patterns: Lexicon entries (regular expressions), one per lexicon line.
+    """
+
+    def __init__(self, patterns: list[str]):
+        self.patterns = [re.compile(r"\b" + pattern + r"\b") for pattern in patterns]
+        self.scanner = re.compile(r"(?=" + "|".join(r"(?:\b" + pattern + r"\b)" for pattern in patterns) + ")")
+
+    def count(self, text: str) -> dict[str, int]:
+        """Returns the number of non-overlapping matches per lexicon entry, keyed by the entry's first matched text.
+
+        Entries are visited in lexicon order, entries without any matches are omitted.
+        """
+
+        first_matches = [""] * len(self.patterns)
+        counts = [0] * len(self.patterns)
+        next_positions = [0] * len(self.patterns)
+
+        for candidate in self.scanner.finditer(text):
+            position = candidate.start()
+            for index, pattern in enumerate(self.patterns):
+                if position >= next_positions[index] and (match := pattern.match(text, position)):
+                    if not counts[index]:
+                        first_matches[index] = match.group()
+                    counts[index] += 1
+                    next_positions[index] = max(match.end(), position + 1)
+
+        matches = defaultdict(int)
+        for first_match, count in zip(first_matches, counts):
+            if count:
+                matches[first_match] += count
+        return matches
+
+
+def _load_profanity_matcher() -> ProfanityMatcher:
+    """Builds the profanity matcher from the lexicon file containing profanity/slurs, one entry per line."""
+
+    filepath = (Path(__file__).parent / "files/profanity.txt").resolve()
+    with open(filepath, "r") as profanity_words:
+        return ProfanityMatcher([line.strip() for line in profanity_words.readlines()])
+
+
+model_registry.register("profanity_matcher", _load_profanity_matcher)
+
+
+class EmotionLexicon(NamedTuple):
+    """Emotion intensity lexicon held as a word index over an intensity matrix.
+
+    :param emotions: Emotion names, in the order of the matrix columns.
+    :param word_index: Maps each lexicon word to its row in the intensity matrix.
+    :param intensities: float32 matrix with one row per word and one column per emotion.
+    """
+    emotions: list[str]
+    word_index: dict[str, int]
+    intensities: "np.ndarray"
+
+
+def _load_emotion_lexicon() -> EmotionLexicon:
+    """Loads the emotion intensity lexicon by Saif M. Mohammad https://saifmohammad.com/WebPages/AffectIntensity.htm
+
+    The file contains words & their degree of association with 8 emotions, one entry per line.
+    """
+
+    import numpy as np
+
+    emotions = ["anger", "anticipation", "disgust", "fear", "sadness", "joy", "surprise", "trust"]
+    filepath = (Path(__file__).parent / "files/emotion_intensity_list.csv").resolve()
+
+    word_index = {}
+    rows = []
+    with open(filepath, "r", newline="") as lexicon_file:
+        for entry in csv.DictReader(lexicon_file, delimiter=";"):
+            if entry["word"] not in word_index:
+                word_index[entry["word"]] = len(rows)
+                rows.append([float(entry[emotion]) for emotion in emotions])
+
+    # only positive intensities count towards emotionality
+    intensities = np.maximum(np.array(rows, dtype=np.float32), 0)
+    return EmotionLexicon(emotions, word_index, intensities)
+
+
+model_registry.register("emotion_lexicon", _load_emotion_lexicon)
+
+
 def evaluate_profanity(data: WebpageData) -> float:
     """Evaluates webpage by checking for occurrences of profanity.
 
@@ -29,17 +122,8 @@ def evaluate_profanity(data: WebpageData) -> float:
     :return: Value between 1 (low profanity) and 0 (high profanity).
     """
 
-    # file containing profanity/slurs, one entry per line
-    profanity_list_path = "files/profanity.txt"
-    filepath = (Path(__file__).parent / profanity_list_path).resolve()
-
     fulltext = data.headline.lower() + " " + data.text.lower()
-    profanity_matches = defaultdict(int)
-
-    with open(filepath, "r") as profanity_words:
-        for line in profanity_words.readlines():
-            if match := re.findall(r"\b" + line.strip() + r"\b", fulltext):
-                profanity_matches[match[0]] += len(match)
+    profanity_matches = model_registry.get("profanity_matcher").count(fulltext)
 
     logger.debug("[Vocabulary] {} profanity matches: {}"
                  .format(len(profanity_matches),
@@ -63,29 +147,17 @@ def evaluate_emotional_words(data: WebpageData) -> float:
     :return: Value between 0 (high emotionality) and 1 (low emotionality).
     """
 
-    # using emotion intensity lexicon by Saif M.Mohammad https://saifmohammad.com/WebPages/AffectIntensity.htm
-
-    # file containing words & their degree of association with 8 emotions, one entry per line, sorted alphabetically
-    emotion_list_path = "files/emotion_intensity_list.csv"
-    filepath = (Path(__file__).parent / emotion_list_path).resolve()
-    emotional_words = pd.read_csv(filepath, sep=";")
+    import numpy as np
 
-    df_size = len(emotional_words)
-    fulltext = word_tokenize(data.headline) + data.text_words
+    lexicon = model_registry.get("emotion_lexicon")
+    fulltext = data.headline_words + data.text_words
     textlength = len(fulltext)
 
-    emotionality_results = {"anger": 0, "anticipation": 0, "disgust": 0, "fear": 0,
-                            "sadness": 0, "joy": 0, "surprise": 0, "trust": 0}
-
-    # lookup all words from article in emotional words list
-    for article_word in fulltext:
-        article_word = article_word.lower()
-        match = emotional_words["word"].searchsorted(article_word)
-        if match < df_size and emotional_words.iat[match, 0] == article_word:
-            # get emotion intensity data for a word match
-            for emotion, emotion_intensity in emotional_words.iloc[match, 1:].items():
-                if emotion_intensity > 0:
-                    emotionality_results[emotion] += emotion_intensity
+    # lookup all words from article in emotional words list, then sum up intensities of all matched rows at once
+    rows = np.fromiter((row for row in (lexicon.word_index.get(word.lower()) for word in fulltext) if row is not None),
+                       dtype=np.intp)
+    intensity_sums = lexicon.intensities[rows].sum(axis=0, dtype=np.float64)
+    emotionality_results = dict(zip(lexicon.emotions, intensity_sums.tolist()))
 
     total_emotion_intensity = sum(emotionality_results.values()) / textlength
 
@@ -0,0 +1,113 @@
+from pathlib import Path
+from typing import NamedTuple, Union, TYPE_CHECKING
+
+from parsing.webpage_parser import valid_address
+from scoring.credibility_evaluation import evaluation_signals, condition_mask
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+class StoredEvaluations(NamedTuple):
+    """Signal sub-scores of previously evaluated webpages, as exported by stats_collector.results_to_csv().
+
+    :param urls: URLs of the evaluated webpages.
+    :param signals: Signal names, in the order of the matrix columns.
+    :param subscores: Matrix of sub-scores, one row per webpage and one column per signal.
+    :param applicable: Boolean matrix of the same shape, False where a signal's weight conditions don't hold for a
+        webpage (e.g. headline signals for webpages without headline).
+    :param base_weights: The signals' current base weights.
+    :param ratings: The webpages' stored credibility ratings, if available.
+    :param credibility_scores: The webpages' stored overall credibility scores, if available.
+    """
+    urls: list[str]
+    signals: list[str]
+    subscores: "np.ndarray"
+    applicable: "np.ndarray"
+    base_weights: "np.ndarray"
+    ratings: "np.ndarray"
+    credibility_scores: "np.ndarray"
+
+
+def load_evaluations(*csv_paths: Union[str, Path]) -> StoredEvaluations:
+    """Loads stored sub-scores (score_* columns) of evaluated webpages from one or more stats csv files.
+
+    Webpages without a complete set of sub-scores (failed evaluations) are skipped. Page conditions of the signal
+    weights are reconstructed from the stored statistics, see _page_condition_flags.
+    """
+
+    import numpy as np
+    import pandas as pd
+
+    table = pd.concat([pd.read_csv(path, sep=";", index_col="url") for path in csv_paths])
+    signals = list(evaluation_signals.keys())
+    columns = ["score_" + signal_name for signal_name in signals]
+    table = table.dropna(subset=columns)
+    subscores = table[columns].to_numpy(dtype=np.float64)
+
+    applicable = condition_mask(subscores, _page_condition_flags(table))
+    base_weights = np.array([signal.weight.base for signal in evaluation_signals.values()], dtype=np.float64)
+
+    missing = np.full(len(table), np.nan)
+    return StoredEvaluations(list(table.index), signals, subscores, applicable, base_weights,
+                             table["rating"].to_numpy(dtype=np.float64) if "rating" in table else missing,
+                             table["credibility_score"].to_numpy(dtype=np.float64)
+                             if "credibility_score" in table else missing)
+
+
+def _page_condition_flags(table: "pd.DataFrame") -> dict[str, "np.ndarray"]:
+    """Reconstructs the page conditions of signal weights from stored statistics of evaluated webpages.
+
+    Headline statistics are -10 if the webpage has no headline, the all caps title statistic is also -10 if the
+    headline is entirely capitalised. Evaluated webpages always have a URL and html.
+    """
+
+    import numpy as np
+
+    no_statistic = np.zeros(len(table))
+    word_count_title = table["word_count_title"].to_numpy() if "word_count_title" in table else no_statistic
+    all_caps_title = table["all_caps_title"].to_numpy() if "all_caps_title" in table else no_statistic
+    return {"headline": word_count_title != -10,
+            "url": np.ones(len(table), dtype=bool),
+            "valid_url": np.array([valid_address(url) for url in table.index], dtype=bool),
+            "headline_not_all_caps": all_caps_title != -10}
+
+
+def weight_vector(evaluations: StoredEvaluations, weights: dict[str, float] = None) -> "np.ndarray":
+    """Returns a weight configuration as vector over the signals, signals not in **weights** keep their current weight.
+
+    :param evaluations: The stored evaluations the configuration is used for.
+    :param weights: New base weights by signal name.
+    """
+
+    vector = evaluations.base_weights.copy()
+    for signal_name, weight in (weights or {}).items():
+        vector[evaluations.signals.index(signal_name)] = weight
+    return vector
+
+
+def rescore(evaluations: StoredEvaluations, weights: "np.ndarray") -> "np.ndarray":
+    """Recomputes overall credibility scores of stored evaluations for one or many weight configurations.
+
+    Applies the same linear combination as evaluate_webpage, including the rescaling of weights from 1x to 2x for
+    sub-scores between 0.75 and 0.25, as a single matrix product over all webpages and configurations.
+
+    :param evaluations: Stored sub-scores, see load_evaluations.
+    :param weights: Base weights, either a vector over the signals (see weight_vector) or a matrix with one weight
+        configuration per row.
+    :return: Credibility scores, a vector over the webpages for a single configuration, otherwise a matrix with one row
+        per webpage and one column per configuration. NaN where all applicable weights are zero.
+    """
+
+    import numpy as np
+
+    weights = np.asarray(weights, dtype=np.float64)
+    configurations = np.atleast_2d(weights)
+
+    subscores = evaluations.subscores
+    weight_factors = (2 - np.clip((subscores - 0.25) * 2, 0, 1)) * evaluations.applicable
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = ((subscores * weight_factors) @ configurations.T) / (weight_factors @ configurations.T)
+
+    return scores[:, 0] if weights.ndim == 1 else scores
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from parsing.webpage_data import WebpageData
+from parsing.webpage_parser import PARSER_VERSION
+
+# default location of the sub-score cache database
+SCORE_CACHE_PATH = (Path(__file__).parent.parent / ".cache/subscores.sqlite").resolve()
+
+logger = logging.getLogger("alpaca")
+
+# enable via enable_score_cache()
+_cache = None
+
+
+class ScoreCache:
+    """Persistent store of signal sub-scores and the statistics reported while computing them.
+
+    Entries are keyed by webpage content hash, signal name and signal version, so changing one evaluator (and
+    increasing its version) only invalidates that signal's sub-scores.
+
+    :param path: Path of the SQLite database file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        os.makedirs(self.path.parent, exist_ok=True)
+        self._connections = threading.local()
+        with self._connection() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS subscores (content_hash TEXT, signal TEXT, version INTEGER, "
+                               "score REAL, stats TEXT, PRIMARY KEY (content_hash, signal, version))")
+
+    def lookup(self, content_hash: str, signal: str, version: int) -> Optional[tuple[float, dict[str, float]]]:
+        """Returns the cached sub-score and statistics of a signal for a webpage, or None if not cached."""
+
+        row = self._connection().execute("SELECT score, stats FROM subscores WHERE content_hash = ? AND signal = ? "
+                                         "AND version = ?", (content_hash, signal, version)).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def store(self, content_hash: str, signal: str, version: int, score: float, stats: dict[str, float]):
+        """Stores the sub-score of a signal for a webpage, together with the statistics reported while computing it."""
+
+        try:
+            with self._connection() as connection:
+                connection.execute("INSERT OR REPLACE INTO subscores VALUES (?, ?, ?, ?, ?)",
+                                   (content_hash, signal, version, score, json.dumps(stats)))
+        except sqlite3.Error as err:
+            logger.warning("[Score cache] Could not store sub-score: " + str(err))
+
+    def clear(self, signal: str = None):
+        """Removes all cached sub-scores, or only those of the given signal."""
+
+        with self._connection() as connection:
+            if signal:
+                connection.execute("DELETE FROM subscores WHERE signal = ?", (signal,))
+            else:
+                connection.execute("DELETE FROM subscores")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns this thread's database connection (connections can't be shared between threads or processes)."""
+
+        if getattr(self._connections, "pid", None) != os.getpid():
+            self._connections.connection = sqlite3.connect(self.path, timeout=60)
+            self._connections.pid = os.getpid()
+        return self._connections.connection
+
+
+def content_hash(data: WebpageData) -> str:
+    """Hashes all webpage content evaluators depend on, including the parser version for tokenization results."""
+
+    content = hashlib.sha256()
+    for part in [str(PARSER_VERSION), data.url, data.headline, data.text, "\n".join(data.authors), data.html]:
+        content.update(part.encode("utf-8", errors="replace"))
+        content.update(b"\0")
+    return content.hexdigest()
+
+
+def enable_score_cache(path: Path = SCORE_CACHE_PATH):
+    """Enables the persistent sub-score cache."""
+
+    global _cache
+    _cache = ScoreCache(path)
+
+
+def disable_score_cache():
+    """Disables the sub-score cache."""
+
+    global _cache
+    _cache = None
+
+
+def get_score_cache() -> Optional[ScoreCache]:
+    """Returns the active sub-score cache, or None if caching is disabled."""
+
+    return _cache
@@ -1,11 +1,12 @@
 import os
 import re
+import threading
 from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
-import pandas as pd
-
+import timing
 from parsing.webpage_parser import valid_address, get_real_url
 
 # collects signal statistics
@@ -14,6 +15,9 @@ results = defaultdict(lambda: defaultdict(float))
 # toggle signal statistics via set_stats_collection()
 _STATS_ENABLED = False
 
+# per-thread stack of dicts recording added data values, see capture_results()
+_captures = threading.local()
+
 
 def set_stats_collection(enable_or_disable: bool):
     """Set whether the program should collect signal statistics for the processed webpages."""
@@ -22,6 +26,12 @@ def set_stats_collection(enable_or_disable: bool):
     _STATS_ENABLED = enable_or_disable
 
 
+def stats_collection_enabled() -> bool:
+    """Returns whether the program currently collects signal statistics."""
+
+    return _STATS_ENABLED
+
+
 def add_result(url: str, field: str, value: float):
     """Add data value regarding a webpage to the module. Collected data can later be exported as csv file.
 
@@ -30,20 +40,64 @@ def add_result(url: str, field: str, value: float):
     :param value: Value of the data point to be added.
     """
 
-    if _STATS_ENABLED:
+    for capture in getattr(_captures, "stack", []):
+        capture[field] = value
+    if _STATS_ENABLED and not getattr(_captures, "detached", 0):
         results[url][field] = value
 
 
+@contextmanager
+def capture_results(detached: bool = False) -> dict[str, float]:
+    """Context manager recording all data values added by the current thread within the context, by field name.
+
+    Values are recorded even if stats collection is disabled, so that they can be stored and re-added later.
+
+    :param detached: If True, values added within the context are only recorded and not collected, e.g. to add them
+        in a deterministic order after concurrent evaluation.
+    """
+
+    capture = {}
+    if not hasattr(_captures, "stack"):
+        _captures.stack = []
+        _captures.detached = 0
+    _captures.stack.append(capture)
+    _captures.detached += detached
+    try:
+        yield capture
+    finally:
+        _captures.stack.pop()
+        _captures.detached -= detached
+
+
+def pop_results(url: str) -> dict[str, float]:
+    """Removes and returns all data values collected for a webpage (e.g. to send them to another process)."""
+
+    return dict(results.pop(url, {}))
+
+
+def add_results(url: str, values: dict[str, float]):
+    """Add multiple data values regarding a webpage to the module, in the given order (see add_result)."""
+
+    for field, value in values.items():
+        add_result(url, field, value)
+
+
 def results_to_csv():
-    """Exports webpage statistics currently held by the module to a csv file."""
+    """Exports webpage statistics currently held by the module to a csv file.
+
+    Stage timings collected by the timing module are exported alongside, to a json file of the same name.
+    """
 
     if _STATS_ENABLED and results:
+        import pandas as pd
+
         dirpath = (Path(__file__).parent / ".stats/").resolve()
         os.makedirs(dirpath, exist_ok=True)
         csvpath = (dirpath / ("stats_" + datetime.now().strftime("%Y-%m-%d_%Hh%Mm%Ss") + ".csv")).resolve()
         results_df = pd.DataFrame.from_dict(results, orient="index")
         results_df.index.rename("url", inplace=True)
         results_df.to_csv(path_or_buf=csvpath, sep=";", float_format="%.10f")
+        timing.timings_to_json(csvpath.with_suffix(".timings.json"))
 
 
 def clear_results():
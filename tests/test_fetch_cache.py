@@ -0,0 +1,30 @@
+import os
+
+from parsing.fetch_cache import FetchCache
+
+
+def _stored_size(cache: FetchCache) -> int:
+    return sum(path.stat().st_size for path in cache.objects_dir.glob("*.html.gz"))
+
+
+def test_refetching_a_url_keeps_the_size_limit(tmp_path):
+    cache = FetchCache(tmp_path, max_size=200 * 1024)
+    for _ in range(400):
+        html = "<html><body>{}</body></html>".format(os.urandom(4096).hex())
+        cache.put("https://www.example.com/news", html)
+
+    assert cache.get("https://www.example.com/news") == html
+    assert _stored_size(cache) <= 200 * 1024
+
+
+def test_eviction_removes_least_recently_used_entries(tmp_path):
+    cache = FetchCache(tmp_path, max_size=100 * 1024)
+    urls = ["https://www.example.com/{}".format(number) for number in range(100)]
+    for url in urls:
+        cache.put(url, os.urandom(4096).hex())
+        cache.get(urls[0])
+
+    assert cache.get(urls[0]) is not None
+    assert cache.get(urls[1]) is None
+    assert cache.get(urls[-1]) is not None
+    assert _stored_size(cache) <= 100 * 1024
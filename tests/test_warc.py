@@ -0,0 +1,25 @@
+import io
+
+from parsing.warc import iter_html_pages
+
+_RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n\r\n<html><body>Text</body></html>"
+
+
+def _record(url: bytes, payload: bytes) -> bytes:
+    headers = b"WARC/1.0\r\nWARC-Type: response\r\nWARC-Target-URI: " + url + b"\r\n"
+    headers += b"Content-Type: application/http; msgtype=response\r\nContent-Length: " + str(len(payload)).encode()
+    return headers + b"\r\n\r\n" + payload + b"\r\n\r\n"
+
+
+def test_malformed_records_are_skipped():
+    # body is not valid chunked transfer encoding
+    chunked = _RESPONSE.replace(b"\r\n\r\n", b"\r\nTransfer-Encoding: chunked\r\n\r\n")
+    archive = (_record(b"https://www.example.com/a", _RESPONSE)
+               + _record(b"https://www.example.com/empty", b"")
+               + b"not a record\r\n"
+               + _record(b"https://www.example.com/chunked", chunked)
+               + _record(b"https://www.example.com/b", _RESPONSE))
+
+    pages = list(iter_html_pages(io.BytesIO(archive)))
+    assert [url for url, _ in pages] == ["https://www.example.com/a", "https://www.example.com/b"]
+    assert "Text" in pages[0][1]
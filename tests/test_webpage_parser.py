@@ -0,0 +1,21 @@
+import copy
+
+import pytest
+
+from parsing.webpage_parser import parse_html
+
+
+def test_text_extraction_from_shared_tree_matches_html_string():
+    trafilatura = pytest.importorskip("trafilatura")
+
+    text = "the news of the day in some detail, with enough words to be kept as article text by the extractor"
+    paragraphs = ["<p>Paragraph {} talks<!-- note --> about {}.</p>".format(number, text) for number in range(2)]
+    paragraphs += ["<p>Paragraph {} <?php echo 1 ?> talks about {}.</p>".format(number, text) for number in range(2, 4)]
+    html = "<html><head><title>Title</title></head><body><article>{}</article></body></html>".format(
+        "".join(paragraphs))
+
+    from_string = trafilatura.extract(html, include_comments=False, include_tables=False)
+    from_tree = trafilatura.extract(copy.deepcopy(parse_html(html)), include_comments=False, include_tables=False)
+    assert from_string
+    assert from_tree == from_string
+    assert from_tree.count("\n") == 3
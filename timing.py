@@ -0,0 +1,139 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Union
+
+# resolution of the latency histograms, in buckets per power of ten (20 buckets are ~12% wide)
+BUCKETS_PER_DECADE = 20
+# percentiles reported for each stage
+PERCENTILES = (50, 95, 99)
+
+# latency histograms by stage name, see timed()
+_histograms = {}
+_lock = threading.Lock()
+
+
+class LatencyHistogram:
+    """Histogram of durations with logarithmic buckets, memory use is constant regardless of the number of durations.
+
+    Percentiles are accurate to the width of a bucket, see **BUCKETS_PER_DECADE**.
+    """
+
+    def __init__(self):
+        self.buckets = defaultdict(int)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        """Adds a single duration in seconds."""
+
+        self.buckets[math.floor(math.log10(max(seconds, 1e-9)) * BUCKETS_PER_DECADE)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram"):
+        """Adds all durations of another histogram, e.g. one collected by a worker process."""
+
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] += count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """Returns the approximate duration below which **percent** percent of the durations lie."""
+
+        rank = percent / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                # geometric centre of the bucket, within the observed range
+                return min(max(10 ** ((bucket + 0.5) / BUCKETS_PER_DECADE), self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """Returns count, mean, min, max and percentiles (in seconds), plus the histogram as (upper bound, count)."""
+
+        summary = {"count": self.count,
+                   "mean": self.total / self.count if self.count else 0.0,
+                   "min": self.min if self.count else 0.0,
+                   "max": self.max}
+        for percent in PERCENTILES:
+            summary["p{}".format(percent)] = self.percentile(percent)
+        summary["histogram"] = [(10 ** ((bucket + 1) / BUCKETS_PER_DECADE), self.buckets[bucket])
+                                for bucket in sorted(self.buckets)]
+        return summary
+
+
+def add_timing(stage: str, seconds: float):
+    """Adds the duration of a stage of webpage evaluation (e.g. "fetch", "signal_errors") to its histogram."""
+
+    with _lock:
+        if stage not in _histograms:
+            _histograms[stage] = LatencyHistogram()
+        _histograms[stage].add(seconds)
+
+
+@contextmanager
+def timed(stage: str):
+    """Context manager measuring the duration of a stage of webpage evaluation, see add_timing()."""
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(stage, time.perf_counter() - start)
+
+
+def pop_timings() -> dict[str, LatencyHistogram]:
+    """Removes and returns all histograms collected so far (e.g. to send them from a worker to the main process)."""
+
+    global _histograms
+    with _lock:
+        histograms, _histograms = _histograms, {}
+    return histograms
+
+
+def add_timings(histograms: dict[str, LatencyHistogram]):
+    """Merges histograms by stage name into the ones collected by this process, see pop_timings()."""
+
+    with _lock:
+        for stage, histogram in histograms.items():
+            _histograms.setdefault(stage, LatencyHistogram()).merge(histogram)
+
+
+def clear_timings():
+    """Resets all collected histograms."""
+
+    pop_timings()
+
+
+def timings_summary() -> dict[str, dict]:
+    """Returns the summaries of all collected histograms by stage name, see LatencyHistogram.summary()."""
+
+    with _lock:
+        return {stage: _histograms[stage].summary() for stage in sorted(_histograms)}
+
+
+def timings_to_json(path: Union[str, Path] = None):
+    """Exports the collected stage timings to a json file, by default in the .stats directory."""
+
+    if path is None:
+        dirpath = (Path(__file__).parent / ".stats/").resolve()
+        os.makedirs(dirpath, exist_ok=True)
+        path = dirpath / ("timings_" + datetime.now().strftime("%Y-%m-%d_%Hh%Mm%Ss") + ".json")
+
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump(timings_summary(), json_file, indent=2)